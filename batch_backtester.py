@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Universe-wide Batch Backtester
+Scores a whole table of candidate strategies (symbol, type, strikes, cost)
+against a symbols x days close matrix in one vectorized pass, instead of one
+practical_strategy_backtest call per strategy per symbol.
+- Strike-independent hit counts (up / down moves, high / low volatility) are
+  computed once per symbol row
+- Profit zones are evaluated per strategy type for all its candidates at once
+Results are identical to backtest_kernels (same counts, same float arithmetic).
+
+Usage (candidates CSV: symbol,strategy_type,buy_strike,sell_strike,net_cost):
+  python batch_backtester.py candidates.csv --days 30 --output scores.csv
+"""
+
+import argparse
+import csv
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from backtest_kernels import DEFAULT_HORIZON, STRATEGY_SCORING, payoff, verdict
+from indicator_engine import to_matrix
+
+CANDIDATE_FIELDS = ('symbol', 'strategy_type', 'buy_strike', 'sell_strike', 'net_cost')
+
+
+class CandidateTable:
+    """Columnar candidate strategies (practical_strategy_backtest's argument convention)"""
+
+    def __init__(self, symbols: Sequence[str], strategy_types: Sequence[str], buy_strikes: Sequence[float],
+                 sell_strikes: Sequence[float], net_costs: Sequence[float]):
+        self.symbols = list(symbols)
+        self.strategy_types = np.asarray(strategy_types, dtype=object)
+        self.buy_strikes = np.asarray(buy_strikes, dtype=np.float64)
+        self.sell_strikes = np.asarray(sell_strikes, dtype=np.float64)
+        self.net_costs = np.asarray(net_costs, dtype=np.float64)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> 'CandidateTable':
+        records = list(records)
+        return cls([r['symbol'] for r in records], [r['strategy_type'] for r in records],
+                   [float(r['buy_strike']) for r in records], [float(r.get('sell_strike') or 0) for r in records],
+                   [float(r['net_cost']) for r in records])
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+class BatchBacktester:
+    """Precomputed scenario matrices for a symbol universe"""
+
+    def __init__(self, closes_by_symbol: Dict[str, Sequence[float]], horizon: int = DEFAULT_HORIZON,
+                 chunk_size: int = 4096):
+        self.symbols = list(closes_by_symbol)
+        self.row_of = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.horizon = horizon
+        self.chunk_size = chunk_size  # candidates per vectorized block (bounds peak memory)
+
+        matrix, self.lengths = to_matrix([closes_by_symbol[symbol] for symbol in self.symbols])
+        if matrix.shape[1] > horizon:
+            entry, self.exit = matrix[:, :-horizon], matrix[:, horizon:]
+        else:
+            entry = self.exit = np.full((len(self.symbols), 0), np.nan)
+
+        # Scenarios need both an entry and an exit close (rows are NaN left-padded)
+        self.valid = ~np.isnan(entry) & ~np.isnan(self.exit)
+        self.totals = np.count_nonzero(self.valid, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            moves_pct = (np.abs(self.exit - entry) / entry) * 100
+            self.hits = {
+                'up': np.count_nonzero(self.exit > entry, axis=1),
+                'down': np.count_nonzero(self.exit < entry, axis=1),
+                'volatile': np.count_nonzero(moves_pct > 2.0, axis=1),
+                'quiet': np.count_nonzero(moves_pct < 1.5, axis=1),
+            }
+
+    def _profitable(self, strategy_type: str, rows: np.ndarray, buy: np.ndarray, sell: np.ndarray,
+                    cost: np.ndarray) -> np.ndarray:
+        """Profitable scenario count per candidate (candidates x scenarios masks)"""
+        exit_ = self.exit[rows]
+        buy, sell, cost = buy[:, None], sell[:, None], cost[:, None]
+        with np.errstate(invalid='ignore'):
+            if strategy_type == 'Bull Call Spread':
+                hit = (exit_ >= sell) | (exit_ >= buy + cost)
+            elif strategy_type == 'Long Call':
+                hit = exit_ >= buy + cost
+            elif strategy_type == 'Long Put':
+                hit = exit_ <= buy - cost
+            elif strategy_type == 'Bear Put Spread':
+                hit = (exit_ <= sell) | (exit_ <= buy - cost)
+            elif strategy_type == 'Long Straddle':
+                hit = (exit_ >= buy + cost) | (exit_ <= buy - cost)
+            else:  # Iron Condor: center strike, wing width, net cost (= -credit)
+                hit = (exit_ >= buy - sell + cost) & (exit_ <= buy + sell - cost)
+        return np.count_nonzero(hit & self.valid[rows], axis=1)
+
+    def score(self, candidates: CandidateTable) -> Dict[str, np.ndarray]:
+        """
+        Scores for every candidate
+        Returns arrays aligned with the table: score, accuracy, profit_accuracy,
+        scenarios_tested and known (False for unknown symbols / strategy types).
+        Candidates without scenarios get NaN scores.
+        """
+        n = len(candidates)
+        rows = np.array([self.row_of.get(symbol, -1) for symbol in candidates.symbols], dtype=np.int64)
+        known = rows >= 0
+        known &= np.array([t in STRATEGY_SCORING for t in candidates.strategy_types], dtype=bool)
+
+        accuracy_hits = np.zeros(n, dtype=np.int64)
+        profitable = np.zeros(n, dtype=np.int64)
+        accuracy_weight = np.zeros(n)
+        profit_weight = np.zeros(n)
+        for strategy_type, (mask, _, weights, _) in STRATEGY_SCORING.items():
+            members = np.flatnonzero(known & (candidates.strategy_types == strategy_type))
+            for start in range(0, len(members), self.chunk_size):
+                block = members[start:start + self.chunk_size]
+                accuracy_hits[block] = self.hits[mask][rows[block]]
+                profitable[block] = self._profitable(strategy_type, rows[block], candidates.buy_strikes[block],
+                                                     candidates.sell_strikes[block], candidates.net_costs[block])
+            accuracy_weight[members], profit_weight[members] = weights
+
+        totals = np.zeros(n, dtype=np.int64)
+        totals[known] = self.totals[rows[known]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            accuracy_pct = np.where(totals > 0, accuracy_hits / totals * 100, np.nan)
+            profit_pct = np.where(totals > 0, profitable / totals * 100, np.nan)
+        return {
+            'score': (accuracy_pct * accuracy_weight) + (profit_pct * profit_weight),
+            'accuracy': accuracy_pct,
+            'profit_accuracy': profit_pct,
+            'scenarios_tested': totals,
+            'known': known,
+        }
+
+    def mean_payoff(self, candidates: CandidateTable) -> np.ndarray:
+        """Average per-share P&L at exit over each candidate's scenarios (NaN if none)"""
+        n = len(candidates)
+        rows = np.array([self.row_of.get(symbol, -1) for symbol in candidates.symbols], dtype=np.int64)
+        totals = np.zeros(n, dtype=np.int64)
+        pnl = np.zeros(n)
+        for strategy_type in STRATEGY_SCORING:
+            members = np.flatnonzero((rows >= 0) & (candidates.strategy_types == strategy_type))
+            for start in range(0, len(members), self.chunk_size):
+                block = members[start:start + self.chunk_size]
+                valid = self.valid[rows[block]]
+                with np.errstate(invalid='ignore'):
+                    per_scenario = payoff(strategy_type, self.exit[rows[block]], candidates.buy_strikes[block, None],
+                                          candidates.sell_strikes[block, None], candidates.net_costs[block, None])
+                pnl[block] = np.where(valid, per_scenario, 0.0).sum(axis=1)
+                totals[block] = self.totals[rows[block]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(totals > 0, pnl / np.maximum(totals, 1), np.nan)
+
+    def results(self, candidates: CandidateTable) -> List[Dict]:
+        """Per-candidate result dicts in backtest_kernels.backtest format"""
+        scores = self.score(candidates)
+        results = []
+        for i, strategy_type in enumerate(candidates.strategy_types):
+            if strategy_type not in STRATEGY_SCORING:
+                results.append({'score': 50, 'verdict': 'UNKNOWN', 'reason': f'Unknown strategy type: {strategy_type}'})
+                continue
+            total = int(scores['scenarios_tested'][i])
+            if not total:
+                results.append({'score': 42, 'verdict': 'NO_DATA',
+                                'reason': f'Not enough history for {self.horizon}-day scenarios'})
+                continue
+            _, accuracy_key, _, reason_label = STRATEGY_SCORING[strategy_type]
+            overall_score = float(scores['score'][i])
+            accuracy_pct = float(scores['accuracy'][i])
+            profit_pct = float(scores['profit_accuracy'][i])
+            results.append({
+                'score': overall_score,
+                'verdict': verdict(overall_score),
+                accuracy_key: accuracy_pct,
+                'profit_accuracy': profit_pct,
+                'scenarios_tested': total,
+                'reason': f'{profit_pct:.1f}% profitable scenarios, {accuracy_pct:.1f}% {reason_label}'
+            })
+        return results
+
+
+def main():
+    from price_history_store import PriceHistoryStore
+
+    parser = argparse.ArgumentParser(description='Backtest a table of candidate strategies for the whole universe')
+    parser.add_argument('candidates', help='CSV with columns: ' + ','.join(CANDIDATE_FIELDS))
+    parser.add_argument('--days', type=int, default=30, help='calendar days of stored history to replay')
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON, help='trading days between entry and exit')
+    parser.add_argument('--output', default='batch_backtest_scores.csv')
+    args = parser.parse_args()
+
+    with open(args.candidates, newline='') as f:
+        records = list(csv.DictReader(f))
+    candidates = CandidateTable.from_records(records)
+
+    store = PriceHistoryStore()
+    closes = {symbol: store.load(symbol, days=args.days)['closes'] for symbol in dict.fromkeys(candidates.symbols)}
+    store.close()
+
+    results = BatchBacktester(closes, horizon=args.horizon).results(candidates)
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(CANDIDATE_FIELDS) + ['score', 'verdict', 'scenarios_tested', 'reason'])
+        for record, result in zip(records, results):
+            writer.writerow([record.get(field) for field in CANDIDATE_FIELDS] +
+                            [result['score'], result['verdict'], result.get('scenarios_tested', 0), result['reason']])
+    print(f"✅ Scored {len(results)} candidates for {len(closes)} symbols → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
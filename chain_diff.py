@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Option Chain Diffs for Incremental Re-analysis
+Compact fingerprint of the parts of a chain the analysis depends on
+(spot price and the ATM-region LTP / OI / volume), and a threshold test
+that decides whether a new snapshot is different enough to re-analyze.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from option_chain import OptionChain
+from strategy_rules import atm_strike_for
+
+
+class ChangeThresholds:
+    """Minimum relative changes (percent) that count as material"""
+
+    def __init__(self, spot_pct: float = 0.25, ltp_pct: float = 5.0, oi_pct: float = 5.0,
+                 volume_pct: float = 10.0, atm_width: float = 200):
+        self.spot_pct = spot_pct
+        self.ltp_pct = ltp_pct
+        self.oi_pct = oi_pct
+        self.volume_pct = volume_pct
+        self.atm_width = atm_width  # points around ATM that are compared
+
+
+class ChainFingerprint:
+    """Spot price + per-strike ATM-region columns of one snapshot"""
+
+    def __init__(self, spot: float, atm_strike: float, strikes: np.ndarray, ltp: np.ndarray,
+                 oi: np.ndarray, volume: np.ndarray):
+        self.spot = spot
+        self.atm_strike = atm_strike
+        self.strikes = strikes
+        self.ltp = ltp
+        self.oi = oi
+        self.volume = volume
+
+    @classmethod
+    def from_chain(cls, option_chain: Dict, atm_width: float = 200) -> 'ChainFingerprint':
+        chain = OptionChain.of(option_chain)
+        spot = chain.underlying_value
+        atm_strike = atm_strike_for(spot)
+        rows = chain.strike_slice(atm_strike - atm_width, atm_strike + atm_width)
+        columns = chain.columns
+        return cls(
+            spot=spot,
+            atm_strike=atm_strike,
+            strikes=chain.strike[rows].copy(),
+            ltp=columns['ce_ltp'][rows] + columns['pe_ltp'][rows],
+            oi=columns['ce_oi'][rows] + columns['pe_oi'][rows],
+            volume=columns['ce_volume'][rows] + columns['pe_volume'][rows],
+        )
+
+
+def _pct_change(old: np.ndarray, new: np.ndarray) -> float:
+    """Largest per-strike relative change in percent (strikes near zero on both sides are ignored)"""
+    base = np.maximum(np.abs(old), 1e-9)
+    changed = (np.abs(old) > 1e-9) | (np.abs(new) > 1e-9)
+    if not changed.any():
+        return 0.0
+    return float(np.max(np.abs(new - old)[changed] / base[changed]) * 100)
+
+
+def material_change(previous: Optional[ChainFingerprint], current: ChainFingerprint,
+                    thresholds: ChangeThresholds) -> Tuple[bool, List[str]]:
+    """
+    Compare two fingerprints
+    Returns: (needs re-analysis, reasons)
+    """
+    if previous is None:
+        return True, ['no previous snapshot']
+
+    reasons = []
+    if previous.atm_strike != current.atm_strike or not np.array_equal(previous.strikes, current.strikes):
+        reasons.append('ATM strikes moved')
+    else:
+        spot_move = abs(current.spot - previous.spot) / previous.spot * 100 if previous.spot else 100.0
+        if spot_move >= thresholds.spot_pct:
+            reasons.append(f'spot moved {spot_move:.2f}%')
+        for name, limit in (('ltp', thresholds.ltp_pct), ('oi', thresholds.oi_pct), ('volume', thresholds.volume_pct)):
+            move = _pct_change(getattr(previous, name), getattr(current, name))
+            if move >= limit:
+                reasons.append(f'ATM {name.upper()} moved {move:.1f}%')
+
+    return bool(reasons), reasons
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fundamentals Cache
+PE / PB / ROE / debt-to-equity change at most quarterly, so they are kept on disk
+and refreshed in the background instead of being fetched on every analysis.
+- FundamentalsCache: one JSON file per symbol, configurable TTL (default 1 day)
+- FundamentalsRefresher: daemon workers that re-download stale symbols; the
+  analysis hot path only reads the cache and queues refreshes, it never waits
+Layout: <cache root>/fundamentals/<SYMBOL>.json
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from local_store import cache_dir, read_json, write_json_atomic
+
+ONE_DAY = 24 * 60 * 60
+
+
+class FundamentalsCache:
+    """On-disk fundamentals per symbol with a TTL"""
+
+    def __init__(self, ttl_seconds: float = ONE_DAY, directory: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory or cache_dir('fundamentals')
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.directory, f"{symbol.upper()}.json")
+
+    def entry(self, symbol: str) -> Optional[Tuple[float, Dict]]:
+        """(fetched_at epoch, fundamentals) of any age, or None"""
+        stored = read_json(self._path(symbol))
+        if not stored or 'data' not in stored:
+            return None
+        return stored.get('fetched_at', 0), stored['data']
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Fundamentals younger than max_age (default: the TTL), else None"""
+        entry = self.entry(symbol)
+        if entry is None:
+            return None
+        fetched_at, data = entry
+        max_age = self.ttl_seconds if max_age is None else max_age
+        return data if time.time() - fetched_at <= max_age else None
+
+    def is_fresh(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def put(self, symbol: str, data: Dict, fetched_at: Optional[float] = None):
+        write_json_atomic(self._path(symbol), {
+            'symbol': symbol.upper(),
+            'fetched_at': fetched_at or time.time(),
+            'data': data
+        })
+
+
+class FundamentalsRefresher:
+    """Background re-download of stale fundamentals (de-duplicated per symbol)"""
+
+    def __init__(self, cache: FundamentalsCache, fetch: Callable[[str], Optional[Dict]],
+                 workers: int = 2, retry_after: float = 300):
+        self.cache = cache
+        self.fetch = fetch
+        self.retry_after = retry_after  # seconds before a failed symbol is tried again
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._failed = {}  # symbol -> time of last failed download
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True, name=f"fundamentals-{i}")
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, symbol: str) -> bool:
+        """Queue a refresh unless one is pending or the last attempt failed recently"""
+        symbol = symbol.upper()
+        with self._lock:
+            if symbol in self._pending:
+                return False
+            failed_at = self._failed.get(symbol)
+            if failed_at is not None and time.time() - failed_at < self.retry_after:
+                return False
+            self._pending.add(symbol)
+        self._queue.put(symbol)
+        return True
+
+    def refresh_stale(self, symbols: Iterable[str]) -> int:
+        """Queue every symbol whose cached fundamentals are missing or older than the TTL"""
+        return sum(1 for symbol in symbols if not self.cache.is_fresh(symbol) and self.request(symbol))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the queue is drained (for batch jobs / warm-up); True if drained"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def _run(self):
+        while True:
+            symbol = self._queue.get()
+            try:
+                data = self.fetch(symbol)
+            except Exception:
+                data = None
+            if data is not None:
+                try:
+                    self.cache.put(symbol, data)
+                except OSError as e:
+                    print(f"⚠️  Could not cache fundamentals for {symbol}: {str(e)}")
+            with self._lock:
+                self._pending.discard(symbol)
+                if data is None:
+                    self._failed[symbol] = time.time()
+                else:
+                    self._failed.pop(symbol, None)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport Layer
+Every NSE / Yahoo / news request goes through sessions created by new_session(),
+so the same code can run against live endpoints or offline:
+
+  live    - real endpoints (default)
+  record  - real endpoints, every response also saved as a cassette on disk
+  replay  - responses served from cassettes, no network at all
+  standin - requests rewritten to the local stand-in server (stand_in_server.py),
+            which serves cassettes with configurable latency and error injection
+
+Configuration: configure(...) or environment variables
+  MARKET_ANALYZER_HTTP_MODE     live | record | replay | standin
+  MARKET_ANALYZER_CASSETTE_DIR  cassette directory (default: <cache root>/cassettes)
+  MARKET_ANALYZER_STANDIN_URL   stand-in server base URL (default: http://127.0.0.1:8765)
+"""
+
+import base64
+import hashlib
+import os
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from local_store import cache_dir, read_json, write_json_atomic
+
+MODES = ('live', 'record', 'replay', 'standin')
+
+# Query parameters that change on every run (time windows) and must not be part of the cassette key
+VOLATILE_PARAMS = {'period1', 'period2', '_', 'crumb'}
+
+_settings = {
+    'mode': os.environ.get('MARKET_ANALYZER_HTTP_MODE', 'live'),
+    'cassette_dir': os.environ.get('MARKET_ANALYZER_CASSETTE_DIR'),
+    'standin_url': os.environ.get('MARKET_ANALYZER_STANDIN_URL', 'http://127.0.0.1:8765'),
+}
+
+
+def configure(mode: Optional[str] = None, cassette_dir: Optional[str] = None, standin_url: Optional[str] = None):
+    """Set the transport mode for sessions created from now on"""
+    if mode is not None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown HTTP mode '{mode}' (expected one of {', '.join(MODES)})")
+        _settings['mode'] = mode
+    if cassette_dir is not None:
+        _settings['cassette_dir'] = cassette_dir
+    if standin_url is not None:
+        _settings['standin_url'] = standin_url.rstrip('/')
+
+
+def current_mode() -> str:
+    return _settings['mode']
+
+
+def _cassette_dir() -> str:
+    directory = _settings['cassette_dir'] or cache_dir('cassettes')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def cassette_key(method: str, url: str) -> str:
+    """Stable key for a request: method + host + path + sorted non-volatile query"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS)
+    normalized = f"{method.upper()} {parts.netloc.lower()}{parts.path}?{urlencode(query)}"
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def cassette_path(method: str, url: str, directory: Optional[str] = None) -> str:
+    host = urlsplit(url).netloc.lower() or 'unknown'
+    folder = os.path.join(directory or _cassette_dir(), host)
+    return os.path.join(folder, f"{cassette_key(method, url)}.json")
+
+
+def save_cassette(method: str, url: str, status: int, headers: Dict[str, str], body: bytes,
+                  directory: Optional[str] = None):
+    """Store one response (body is the decoded content, so encoding headers are dropped)"""
+    path = cassette_path(method, url, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    kept_headers = {k: v for k, v in headers.items()
+                    if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+    write_json_atomic(path, {
+        'method': method.upper(),
+        'url': url,
+        'status': status,
+        'headers': kept_headers,
+        'body': base64.b64encode(body).decode('ascii')
+    })
+
+
+def load_cassette(method: str, url: str, directory: Optional[str] = None) -> Optional[Dict]:
+    """Recorded response for a request: dict with status, headers, body (bytes), or None"""
+    cassette = read_json(cassette_path(method, url, directory))
+    if cassette is None:
+        return None
+    cassette['body'] = base64.b64decode(cassette.get('body', ''))
+    return cassette
+
+
+def _build_response(request: requests.PreparedRequest, status: int, headers: Dict[str, str], body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = request.url
+    response.request = request
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Live requests; every response is also written to a cassette"""
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        try:
+            save_cassette(request.method, request.url, response.status_code, dict(response.headers), response.content)
+        except Exception as e:
+            print(f"⚠️  Could not record cassette for {request.url}: {str(e)}")
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Responses from cassettes only; unrecorded requests get a 404"""
+
+    def send(self, request, **kwargs):
+        cassette = load_cassette(request.method, request.url)
+        if cassette is None:
+            return _build_response(request, 404, {'X-Replay': 'miss'}, b'')
+        return _build_response(request, cassette['status'], cassette.get('headers', {}), cassette['body'])
+
+    def close(self):
+        pass
+
+
+class StandInAdapter(HTTPAdapter):
+    """Rewrites https://host/path?query to <stand-in>/host/path?query"""
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if not request.url.startswith(self.base_url):
+            query = f"?{parts.query}" if parts.query else ''
+            request.url = f"{self.base_url}/{parts.netloc}{parts.path}{query}"
+        return super().send(request, **kwargs)
+
+
+def new_session(pool_maxsize: int = 10) -> requests.Session:
+    """requests.Session wired to the configured transport mode"""
+    session = requests.Session()
+    mode = _settings['mode']
+
+    if mode == 'record':
+        adapter = RecordingAdapter(pool_maxsize=pool_maxsize)
+    elif mode == 'replay':
+        adapter = ReplayAdapter()
+    elif mode == 'standin':
+        adapter = StandInAdapter(_settings['standin_url'], pool_maxsize=pool_maxsize)
+    else:
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
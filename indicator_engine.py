@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Vectorized Technical Indicator Engine
+Indicators for the whole symbol universe in one NumPy pass over a
+symbols x days matrix (one row per symbol, oldest day first).
+- Rows may have different history lengths: shorter rows are left-padded with NaN
+- RSI: 'wilder' (proper Wilder smoothing) or 'simple' (the analyzer's original
+  14-day mean RSI with its short-history momentum fallback)
+- SMA / EMA / ATR / Bollinger bands / trend labels
+The 'simple' RSI, SMAs and trend labels match the analyzer's original
+per-symbol implementation (parity check: tests/test_indicator_engine.py).
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RSI_PERIOD = 14
+
+
+def to_matrix(series: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ragged per-symbol histories -> (NaN left-padded matrix, history lengths)
+    None values are dropped (same as the analyzer's price filtering)
+    """
+    rows = [[float(v) for v in values if v is not None] for values in series]
+    lengths = np.array([len(row) for row in rows], dtype=np.int64)
+    width = int(lengths.max()) if len(rows) and lengths.max() > 0 else 1
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        if row:
+            matrix[i, width - len(row):] = row
+    return matrix, lengths
+
+
+def _lengths(matrix: np.ndarray) -> np.ndarray:
+    return np.sum(~np.isnan(matrix), axis=1)
+
+
+def _tail_mean(matrix: np.ndarray, window: int, lengths: np.ndarray) -> np.ndarray:
+    """Mean of the last min(window, length) values per row (NaN for empty rows)"""
+    total = np.nansum(matrix[:, -window:], axis=1)
+    count = np.minimum(window, lengths)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def _head_mean(matrix: np.ndarray, window: int, lengths: np.ndarray) -> np.ndarray:
+    """Mean of the first `window` valid values per row (rows need length >= window)"""
+    width = matrix.shape[1]
+    start = np.clip(width - lengths, 0, max(width - window, 0))
+    columns = np.minimum(start[:, None] + np.arange(window), width - 1)
+    return matrix[np.arange(len(matrix))[:, None], columns].mean(axis=1)
+
+
+def _wilder(values: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Wilder smoothing of each row (seeded with the mean of the first `period` values)
+    Returns: (latest smoothed value, number of valid values) - rows with fewer than
+    `period` values get the plain mean of what they have
+    """
+    n = len(values)
+    count = np.zeros(n, dtype=np.int64)
+    total = np.zeros(n)
+    smoothed = np.full(n, np.nan)
+
+    for column in values.T:
+        valid = ~np.isnan(column)
+        count += valid
+        x = np.where(valid, column, 0.0)
+        seeding = valid & (count <= period)
+        total += np.where(seeding, x, 0.0)
+        seeded = valid & (count == period)
+        smoothed = np.where(seeded, total / period, smoothed)
+        stepping = valid & (count > period)
+        smoothed = np.where(stepping, (smoothed * (period - 1) + x) / period, smoothed)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        partial = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+    return np.where(count >= period, smoothed, partial), count
+
+
+def sma(closes: np.ndarray, window: int) -> np.ndarray:
+    """Latest simple moving average (shorter histories average what they have)"""
+    return _tail_mean(closes, window, _lengths(closes))
+
+
+def ema(closes: np.ndarray, span: int) -> np.ndarray:
+    """Latest exponential moving average (alpha = 2 / (span + 1), seeded with the first close)"""
+    alpha = 2.0 / (span + 1)
+    value = np.full(len(closes), np.nan)
+    for column in closes.T:
+        valid = ~np.isnan(column)
+        value = np.where(valid & np.isnan(value), column,
+                         np.where(valid, alpha * column + (1 - alpha) * value, value))
+    return value
+
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+
+def _short_history_rsi(closes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """The analyzer's fallback for < 14 closes: 5-day momentum mapped to 0-100 (50 below 5 closes)"""
+    rsi = np.full(len(closes), 50.0)
+    enough = lengths >= 5
+    if enough.any():
+        recent_avg = _tail_mean(closes, 5, lengths)
+        older_avg = _head_mean(closes, 5, np.maximum(lengths, 5))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            momentum_rsi = np.clip(50 + (recent_avg - older_avg) / older_avg * 100, 0, 100)
+        rsi = np.where(enough & (older_avg > 0), momentum_rsi, rsi)
+    return rsi
+
+
+def rsi(closes: np.ndarray, period: int = RSI_PERIOD, method: str = 'wilder') -> np.ndarray:
+    """
+    Latest RSI per row
+    method='wilder': Wilder-smoothed average gain / loss (needs period + 1 closes)
+    method='simple': mean gain / loss of the last `period` moves (needs `period` closes)
+    Shorter histories use the analyzer's momentum fallback in both modes
+    """
+    if method not in ('wilder', 'simple'):
+        raise ValueError(f"Unknown RSI method '{method}' (expected 'wilder' or 'simple')")
+
+    lengths = _lengths(closes)
+    deltas = np.diff(closes, axis=1)
+    gains = np.where(np.isnan(deltas), np.nan, np.clip(deltas, 0, None))
+    losses = np.where(np.isnan(deltas), np.nan, np.clip(-deltas, 0, None))
+
+    if method == 'simple':
+        # Fixed divisor: 14 closes give 13 moves, still divided by 14 (original behaviour)
+        avg_gain = np.nansum(gains[:, -period:], axis=1) / period
+        avg_loss = np.nansum(losses[:, -period:], axis=1) / period
+        full = lengths >= period
+    else:
+        avg_gain, moves = _wilder(gains, period)
+        avg_loss, _ = _wilder(losses, period)
+        full = moves >= period
+
+    return np.where(full, _rsi_from_averages(avg_gain, avg_loss), _short_history_rsi(closes, lengths))
+
+
+def atr(highs: Optional[np.ndarray], lows: Optional[np.ndarray], closes: np.ndarray,
+        period: int = 14) -> np.ndarray:
+    """Latest Wilder ATR (close-to-close ranges when highs / lows are not given)"""
+    if highs is None or lows is None:
+        highs = lows = closes
+    previous = np.concatenate([np.full((len(closes), 1), np.nan), closes[:, :-1]], axis=1)
+    with np.errstate(invalid='ignore'):
+        true_range = np.fmax(highs - lows, np.fmax(np.abs(highs - previous), np.abs(lows - previous)))
+    true_range = np.where(np.isnan(closes), np.nan, true_range)
+    value, _ = _wilder(true_range, period)
+    return value
+
+
+def bollinger(closes: np.ndarray, window: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Latest (middle, upper, lower) Bollinger bands (population std over the window)"""
+    lengths = _lengths(closes)
+    middle = _tail_mean(closes, window, lengths)
+    tail = closes[:, -window:]
+    with np.errstate(invalid='ignore'):
+        variance = np.nansum((tail - middle[:, None]) ** 2, axis=1) / np.maximum(np.minimum(window, lengths), 1)
+    std = np.sqrt(variance)
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def trend(closes: np.ndarray) -> np.ndarray:
+    """UPTREND / DOWNTREND / SIDEWAYS from last-5 vs previous-5 average (2% threshold)"""
+    lengths = _lengths(closes)
+    labels = np.full(len(closes), 'SIDEWAYS', dtype=object)
+    if closes.shape[1] < 10:
+        return labels
+    recent_avg = np.mean(closes[:, -5:], axis=1)
+    older_avg = np.mean(closes[:, -10:-5], axis=1)
+    enough = lengths >= 10
+    with np.errstate(invalid='ignore'):
+        labels[enough & (recent_avg > older_avg * 1.02)] = 'UPTREND'
+        labels[enough & (recent_avg < older_avg * 0.98)] = 'DOWNTREND'
+    return labels
+
+
+def compute(closes: np.ndarray, highs: Optional[np.ndarray] = None, lows: Optional[np.ndarray] = None,
+            rsi_method: str = 'wilder') -> Dict[str, np.ndarray]:
+    """All indicators for every row of a symbols x days close matrix"""
+    middle, upper, lower = bollinger(closes)
+    return {
+        'rsi': rsi(closes, method=rsi_method),
+        'sma_10': sma(closes, 10),
+        'sma_20': sma(closes, 20),
+        'ema_12': ema(closes, 12),
+        'ema_26': ema(closes, 26),
+        'atr_14': atr(highs, lows, closes),
+        'bollinger_mid': middle,
+        'bollinger_upper': upper,
+        'bollinger_lower': lower,
+        'trend': trend(closes),
+    }
+
+
+def universe_indicators(closes_by_symbol: Dict[str, List[float]], rsi_method: str = 'simple',
+                        highs_by_symbol: Optional[Dict[str, List[float]]] = None,
+                        lows_by_symbol: Optional[Dict[str, List[float]]] = None) -> Dict[str, Dict]:
+    """
+    Indicator dicts (same keys / rounding as calculate_technical_indicators, plus the extras)
+    for every symbol at once. RSI defaults to the analyzer's original 'simple' method; the
+    Wilder RSI is always included as 'rsi_wilder'.
+    """
+    symbols = list(closes_by_symbol)
+    if not symbols:
+        return {}
+    closes, lengths = to_matrix([closes_by_symbol[s] for s in symbols])
+    highs = lows = None
+    if highs_by_symbol is not None and lows_by_symbol is not None:
+        highs, high_lengths = to_matrix([highs_by_symbol.get(s, []) for s in symbols])
+        lows, low_lengths = to_matrix([lows_by_symbol.get(s, []) for s in symbols])
+        if highs.shape != closes.shape or lows.shape != closes.shape \
+                or not (np.array_equal(high_lengths, lengths) and np.array_equal(low_lengths, lengths)):
+            highs = lows = None  # Misaligned - fall back to close-to-close ranges
+
+    values = compute(closes, highs, lows, rsi_method=rsi_method)
+    values['rsi_wilder'] = values['rsi'] if rsi_method == 'wilder' else rsi(closes, method='wilder')
+
+    results = {}
+    for i, symbol in enumerate(symbols):
+        if lengths[i] < 2:
+            # Same shortcut as the analyzer: no history to speak of
+            first = float(closes[i, -1]) if lengths[i] else 0
+            results[symbol] = {'rsi': 50, 'sma_10': first, 'sma_20': first, 'trend': 'SIDEWAYS'}
+            continue
+        result = {
+            'rsi': round(float(values['rsi'][i]), 2),
+            'sma_10': round(float(values['sma_10'][i]), 2),
+            'sma_20': round(float(values['sma_20'][i]), 2),
+            'trend': values['trend'][i],
+        }
+        for name in ('rsi_wilder', 'ema_12', 'ema_26', 'atr_14', 'bollinger_upper', 'bollinger_lower'):
+            result[name] = round(float(values[name][i]), 2)
+        results[symbol] = result
+    return results
@@ -54,6 +54,18 @@ echo.
 echo 4. Installing brotli (for NSE API decompression)...
 py -mpip install brotli
 
+echo.
+echo 5. Installing numpy (columnar option chains)...
+py -mpip install numpy
+
+echo.
+echo 6. Installing orjson (optional, faster NSE JSON decoding)...
+py -mpip install orjson
+
+echo.
+echo 7. Installing scipy (optional, exact normal CDF for Black-Scholes backtests)...
+py -mpip install scipy
+
 echo.
 echo ==========================================
 echo [OK] Installation Complete!
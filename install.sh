@@ -52,6 +52,15 @@ $PIP_CMD install lxml --break-system-packages 2>/dev/null || $PIP_CMD install lx
 echo "4. Installing brotli (for NSE API decompression)..."
 $PIP_CMD install brotli --break-system-packages 2>/dev/null || $PIP_CMD install brotli
 
+echo "5. Installing numpy (columnar option chains)..."
+$PIP_CMD install numpy --break-system-packages 2>/dev/null || $PIP_CMD install numpy
+
+echo "6. Installing orjson (optional, faster NSE JSON decoding)..."
+$PIP_CMD install orjson --break-system-packages 2>/dev/null || $PIP_CMD install orjson
+
+echo "7. Installing scipy (optional, exact normal CDF for Black-Scholes backtests)..."
+$PIP_CMD install scipy --break-system-packages 2>/dev/null || $PIP_CMD install scipy
+
 echo ""
 echo "=========================================="
 echo "✓ Installation Complete!"
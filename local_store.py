@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Local Store Helpers
+Shared location and file helpers for the analyzer's on-disk caches
+Cache root: $MARKET_ANALYZER_CACHE_DIR (default: ./.market_cache)
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+
+def cache_dir(*parts: str) -> str:
+    """Return (and create) a directory under the analyzer cache root"""
+    root = os.environ.get('MARKET_ANALYZER_CACHE_DIR', '.market_cache')
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def write_json_atomic(path: str, data: Any):
+    """Write JSON via a temp file + rename so readers never see a half-written file"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path: str) -> Optional[Any]:
+    """Read a JSON file, None if missing or corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -11,11 +11,14 @@ Market Analyzer v5.0 - Production Ready
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta
+import bisect
+import importlib.util
 import json
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 import os
 import concurrent.futures
 from threading import Lock
@@ -26,9 +29,35 @@ warnings.filterwarnings('ignore')
 from fno_symbols import get_all_fno_symbols, get_fno_count
 from nse_data_fetcher_clean import NSEDataFetcher
 from lot_sizes import get_lot_size, is_index
+from option_chain import OptionChain, expiry_option_chain
+from http_transport import new_session
+from rate_limiter import TokenBucket
+from sentiment_cache import HeadlineMemo, SentimentCache
+from sentiment_matcher import LEXICON_VERSION, SentimentMatcher
+from news_prefetcher import NewsPrefetcher
+from indicator_engine import universe_indicators
+from streaming_indicators import IndicatorState
+from yahoo_client import YahooClient, chart_bars, yahoo_ticker
+from price_history_store import PriceHistoryStore
+from fundamentals_cache import ONE_DAY, FundamentalsCache, FundamentalsRefresher
+import backtest_kernels
+from batch_backtester import BatchBacktester, CandidateTable
+from strategy_rules import atm_strike_for, fallback_premium, select_strategy
+from chain_diff import ChainFingerprint, ChangeThresholds, material_change
 
 # Backtesting is now fully integrated - no separate module needed
 
+# Calendar days of daily bars used for price data / technical analysis
+HISTORY_DAYS = 90
+
+# Calendar days of bars replayed by practical_strategy_backtest
+BACKTEST_DAYS = 30
+BACKTEST_MIN_CLOSES = 10
+BACKTEST_PRICING = ('intrinsic', 'black_scholes')
+
+# Expiry labels for multi-expiry analysis (nearest first)
+EXPIRY_LABELS = ('near', 'next', 'far')
+
 # Try to import API configuration
 try:
     from config import ALPHAVANTAGE_API_KEY
@@ -38,15 +67,54 @@ except ImportError:
 
 # Backtesting is now integrated into the main analyzer - no separate module needed
 
+# News pages: C-backed lxml parser when installed, pure-Python html.parser otherwise
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+# News host pacing: host -> (sustained requests/second, burst). Google starts serving
+# CAPTCHA pages to sustained scraping above a couple of requests a second; Yahoo's
+# quote pages tolerate more.
+NEWS_HOST_LIMITS = {
+    'www.google.com': (2.0, 5),
+    'finance.yahoo.com': (5.0, 10),
+}
+
+# Only the tags the scrapers read are parsed into the tree
+GOOGLE_NEWS_TAGS = SoupStrainer('div')
+YAHOO_NEWS_TAGS = SoupStrainer('h3')
+
 
 class NewsParser:
     """Parse news from Google News and Yahoo Finance for sentiment"""
     
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, host_limits: Optional[Dict[str, Tuple[float, float]]] = None, max_workers: int = 8,
+                 cache_ttl: float = 1800):
+        self.session = new_session(pool_maxsize=max_workers)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Each news host is paced by its own token bucket (instead of a blanket sleep per symbol);
+        # host_limits overrides NEWS_HOST_LIMITS per host
+        limits = dict(NEWS_HOST_LIMITS, **(host_limits or {}))
+        self.host_limiters = {host: TokenBucket(rate=rate, capacity=burst) for host, (rate, burst) in limits.items()}
+        # Google and Yahoo pages are fetched concurrently
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='news')
+        self.sources = (
+            ('Google News', self.parse_google_news),
+            ('Yahoo Finance', self.parse_yahoo_finance_news),
+        )
+        
+        # Combined sentiment per symbol is reused for cache_ttl seconds; headline scores forever
+        self.cache = SentimentCache(ttl_seconds=cache_ttl)
+        self.headline_memo = HeadlineMemo()
+        self.matcher = SentimentMatcher()
+    
+    def _get(self, url: str, timeout: int = 10) -> requests.Response:
+        """GET paced by the token bucket of the URL's host"""
+        limiter = self.host_limiters.get(urlsplit(url).netloc)
+        if limiter is not None:
+            limiter.acquire()
+        return self.session.get(url, timeout=timeout)
     
     def parse_google_news(self, symbol: str) -> Dict:
         """
@@ -57,12 +125,12 @@ class NewsParser:
             query = f"{symbol} stock news india"
             url = f"https://www.google.com/search?q={query}&tbm=nws&hl=en"
             
-            response = self.session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
             
             if response.status_code != 200:
                 return self._empty_sentiment()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=GOOGLE_NEWS_TAGS)
             
             # Find news articles
             articles = []
@@ -107,12 +175,12 @@ class NewsParser:
         try:
             url = f"https://finance.yahoo.com/quote/{symbol}.NS/news"
             
-            response = self.session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
             
             if response.status_code != 200:
                 return self._empty_sentiment()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=YAHOO_NEWS_TAGS)
             
             # Find news articles
             articles = []
@@ -141,13 +209,58 @@ class NewsParser:
             print(f"⚠️  Yahoo Finance News parsing error for {symbol}: {str(e)}")
             return self._empty_sentiment()
     
-    def get_combined_sentiment(self, symbol: str) -> Dict:
+    def iter_sentiment(self, symbol: str) -> Iterator[Tuple[str, Dict]]:
+        """Yield (source, sentiment) for each news source as soon as it has been parsed"""
+        futures = {self.executor.submit(parse, symbol): source for source, parse in self.sources}
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
+    
+    def get_combined_sentiment(self, symbol: str, max_age: Optional[float] = None) -> Dict:
         """
         Get combined sentiment from both Google News and Yahoo Finance
+        Served from the sentiment cache while younger than max_age (default: cache TTL)
         """
-        google_sentiment = self.parse_google_news(symbol)
-        time.sleep(1)  # Rate limiting
-        yahoo_sentiment = self.parse_yahoo_finance_news(symbol)
+        cached = self.cache.get(symbol, max_age)
+        if cached is not None:
+            return cached
+        
+        by_source = dict(self.iter_sentiment(symbol))
+        return self._store(symbol, self._combine([by_source[source] for source, _ in self.sources]))
+    
+    def _store(self, symbol: str, sentiment: Dict) -> Dict:
+        """Cache a combined sentiment (empty results are not cached, so they are retried)"""
+        if sentiment['news_count']:
+            try:
+                self.cache.put(symbol, sentiment)
+            except OSError as e:
+                print(f"⚠️  Could not cache sentiment for {symbol}: {str(e)}")
+        return sentiment
+    
+    def stream_combined_sentiment(self, symbols: List[str]) -> Iterator[Tuple[str, Dict]]:
+        """
+        Combined sentiment for many symbols, yielded per symbol as soon as all its sources are in
+        Every (symbol, source) page is in flight at once, paced only by the per-host limiters
+        """
+        futures = {}
+        for symbol in symbols:
+            cached = self.cache.get(symbol)
+            if cached is not None:
+                yield symbol, cached
+                continue
+            for source, parse in self.sources:
+                futures[self.executor.submit(parse, symbol)] = (symbol, source)
+        
+        partial = {}
+        for future in concurrent.futures.as_completed(futures):
+            symbol, source = futures[future]
+            partial.setdefault(symbol, {})[source] = future.result()
+            if len(partial[symbol]) == len(self.sources):
+                by_source = partial.pop(symbol)
+                yield symbol, self._store(symbol, self._combine([by_source[name] for name, _ in self.sources]))
+    
+    def _combine(self, sentiments: List[Dict]) -> Dict:
+        """Merge per-source sentiments (headlines kept in source order)"""
+        google_sentiment, yahoo_sentiment = sentiments
         
         # Combine sentiments
         all_headlines = google_sentiment['headlines'] + yahoo_sentiment['headlines']
@@ -169,58 +282,56 @@ class NewsParser:
             'news_count': len(all_headlines)
         }
     
+    def flush(self):
+        """Persist newly scored headlines"""
+        self.headline_memo.flush()
+    
     def _analyze_sentiment(self, headlines: List[str]) -> Dict:
+        """Keyword sentiment summed from per-headline counts, memoized by headline across runs"""
+        if not headlines:
+            return self._empty_sentiment()
+        return self.matcher.combine(self._headline_counts(headlines))
+    
+    def _headline_counts(self, headlines: List[str]) -> List[Tuple[int, int]]:
         """
-        Simple sentiment analysis based on keywords
+        (positive, negative) keyword counts per headline (one compiled word-boundary regex)
         Production: Use NLP libraries like TextBlob or VADER
         """
-        if not headlines:
-            return self._empty_sentiment()
-        
-        positive_words = [
-            'surge', 'jump', 'rally', 'gain', 'profit', 'growth', 'up', 'rise',
-            'high', 'beat', 'strong', 'positive', 'bullish', 'upgrade', 'buy',
-            'outperform', 'record', 'boost', 'success', 'winner', 'top'
-        ]
-        
-        negative_words = [
-            'fall', 'drop', 'crash', 'loss', 'down', 'decline', 'weak', 'negative',
-            'bearish', 'downgrade', 'sell', 'underperform', 'miss', 'concern',
-            'worry', 'risk', 'threat', 'bottom', 'worst', 'fail'
-        ]
-        
-        positive_count = 0
-        negative_count = 0
-        
-        combined_text = ' '.join(headlines).lower()
-        
-        for word in positive_words:
-            positive_count += combined_text.count(word)
-        
-        for word in negative_words:
-            negative_count += combined_text.count(word)
-        
-        total = positive_count + negative_count
-        
-        if total == 0:
-            score = 0
-            momentum = 'NEUTRAL'
-        else:
-            score = (positive_count - negative_count) / total
-            if score > 0.3:
-                momentum = 'POSITIVE'
-            elif score < -0.3:
-                momentum = 'NEGATIVE'
-            else:
-                momentum = 'NEUTRAL'
-        
-        return {
-            'score': round(score, 2),
-            'momentum': momentum,
-            'positive_count': positive_count,
-            'negative_count': negative_count,
-            'news_count': len(headlines)
-        }
+        counts = []
+        for headline in headlines:
+            key = HeadlineMemo.key(headline, LEXICON_VERSION)
+            count = self.headline_memo.get(key)
+            if count is None:
+                count = self.matcher.count(headline)
+                self.headline_memo.put(key, count)
+            counts.append(count)
+        return counts
+    
+    def score_headlines_batch(self, headlines_by_symbol: Dict[str, List[str]]) -> Dict[str, Dict]:
+        """
+        Keyword sentiment for many symbols in one call
+        Memoized headlines are reused; the rest are counted in a single regex pass
+        Offline API (e.g. re-scoring stored headlines after a lexicon change): the scan and
+        the news prefetcher score each page as it arrives via _analyze_sentiment
+        """
+        keys = {symbol: [HeadlineMemo.key(headline, LEXICON_VERSION) for headline in headlines]
+                for symbol, headlines in headlines_by_symbol.items()}
+        counts = {}  # memo key -> (positive, negative)
+        unseen = {}  # memo key -> headline
+        for symbol, headlines in headlines_by_symbol.items():
+            for key, headline in zip(keys[symbol], headlines):
+                if key not in counts:
+                    counts[key] = self.headline_memo.get(key)
+                if counts[key] is None:
+                    unseen.setdefault(key, headline)
+        
+        for key, count in zip(unseen, self.matcher.count_batch(list(unseen.values()))):
+            counts[key] = count
+            self.headline_memo.put(key, count)
+        
+        return {symbol: self.matcher.combine([counts[key] for key in keys[symbol]])
+                if keys[symbol] else self._empty_sentiment()
+                for symbol in headlines_by_symbol}
     
     def _empty_sentiment(self) -> Dict:
         """Return empty sentiment when parsing fails"""
@@ -241,13 +352,38 @@ class IntegratedMarketAnalyzer:
     - Google News for Sentiment
     """
     
-    def __init__(self):
+    def __init__(self, nse_requests_per_second: float = 3.0, option_chain_ttl: float = 60,
+                 incremental: bool = False, change_thresholds: Optional[ChangeThresholds] = None,
+                 expiry_labels: Tuple[str, ...] = (), fundamentals_ttl: float = ONE_DAY,
+                 background_news: bool = True, backtest_pricing: str = 'intrinsic',
+                 news_host_limits: Optional[Dict[str, Tuple[float, float]]] = None):
         # Initialize clean NSE fetcher (no API key needed - uses official NSE API)
-        self.nse = NSEDataFetcher()
-        self.news_parser = NewsParser()
+        # NSE pacing is a shared token bucket - nse_requests_per_second sets overall throughput
+        # Option chains younger than option_chain_ttl seconds are re-used from the local snapshot cache
+        self.nse = NSEDataFetcher(requests_per_second=nse_requests_per_second, cache_ttl=option_chain_ttl)
+        # News hosts are paced per host: news_host_limits overrides NEWS_HOST_LIMITS
+        self.news_parser = NewsParser(host_limits=news_host_limits)
         self.lock = Lock()
         
+        # News sentiment is refreshed by a background daemon; analysis only reads the cache
+        self.news_prefetcher = NewsPrefetcher(self.news_parser) if background_news else None
+        
+        # One pooled keep-alive Yahoo client shared by all worker threads
+        self.yahoo = YahooClient(pool_maxsize=20)
+        # Daily bars persisted across runs - Yahoo is only asked for the missing days
+        self.history = PriceHistoryStore()
+        # Per-run bars (symbol -> bars dict) shared by price data, indicators and backtests
+        self.run_history = {}
+        
+        # Fundamentals change quarterly - served from disk, refreshed in the background
+        self.fundamentals_cache = FundamentalsCache(ttl_seconds=fundamentals_ttl)
+        self.fundamentals_refresher = FundamentalsRefresher(self.fundamentals_cache, self.download_fundamentals)
+        
         # Backtesting is now fully integrated - no separate module needed
+        # 'intrinsic': value at exit vs today's premium; 'black_scholes': daily premium marks
+        if backtest_pricing not in BACKTEST_PRICING:
+            raise ValueError(f"Unknown backtest pricing '{backtest_pricing}' (expected one of {BACKTEST_PRICING})")
+        self.backtest_pricing = backtest_pricing
         
         # Silent initialization
         
@@ -256,6 +392,33 @@ class IntegratedMarketAnalyzer:
         self.medium_confidence = []
         self.low_confidence = []
         
+        # Option chains downloaded up-front by analyze_all_parallel (async prefetch)
+        self.prefetched_chains = {}
+        # Price data downloaded up-front in one Yahoo batch
+        self.prefetched_prices = {}
+        # symbol -> (price data, indicators) computed for the whole batch at once
+        self.precomputed_technical = {}
+        # symbol -> streaming IndicatorState (kept across scans, advanced per new bar)
+        self.indicator_states = {}
+        
+        # Incremental mode: re-use the previous result while the chain has not changed materially
+        self.incremental = incremental
+        self.change_thresholds = change_thresholds or ChangeThresholds()
+        self.previous_results = {}  # symbol -> (ChainFingerprint, result)
+        
+        # Extra per-expiry strategies (e.g. ('near', 'next', 'far')) evaluated from the same download
+        self.expiry_labels = tuple(expiry_labels)
+        
+        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    def start_new_scan(self):
+        """Clear the confidence buckets before re-scanning (incremental results are kept)"""
+        with self.lock:
+            self.high_confidence = []
+            self.medium_confidence = []
+            self.low_confidence = []
+        self.run_history = {}
+        self.precomputed_technical = {}
         self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     def fetch_price_data(self, symbol: str) -> Optional[Dict]:
@@ -269,89 +432,19 @@ class IntegratedMarketAnalyzer:
             return None
     
     def fetch_yahoo_data(self, symbol: str) -> Optional[Dict]:
-        """Fetch from Yahoo Finance as backup"""
+        """Fetch from Yahoo Finance as backup (batch-prefetched prices are used first)"""
+        prefetched = self.prefetched_prices.pop(symbol, None)
+        if prefetched is not None:
+            return prefetched
+        
+        ticker = yahoo_ticker(symbol)
         try:
-            # Handle special symbols
-            if symbol == 'NIFTY':
-                ticker = '^NSEI'  # NIFTY 50 index
-            elif symbol == 'BANKNIFTY':
-                ticker = '^NSEBANK'  # Bank NIFTY index
-            elif symbol.startswith('^'):
-                ticker = symbol  # Index symbols like ^NSEI
-            else:
-                ticker = f"{symbol}.NS"  # Add .NS for Indian stocks
-            
-            end_date = int(time.time())
-            start_date = end_date - (90 * 24 * 60 * 60)  # 90 days for better data
-            
-            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-            params = {
-                'period1': start_date,
-                'period2': end_date,
-                'interval': '1d',
-                'includePrePost': 'false'
-            }
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=15)
+            # 90 days for better data - only the bars since the last stored day are downloaded
+            response = self.yahoo.chart_response(symbol, days=HISTORY_DAYS, start=self._history_start(symbol))
             
             if response.status_code == 200:
                 try:
-                    data = response.json()
-                    
-                    # Check if the response has valid chart data
-                    if not data.get('chart') or not data['chart'].get('result'):
-                        print(f"   ⚠️  Yahoo: No chart data for {ticker}")
-                        return None
-                    
-                    chart = data['chart']['result'][0]
-                    
-                    # Check if the chart has indicators
-                    if not chart.get('indicators') or not chart['indicators'].get('quote'):
-                        print(f"   ⚠️  Yahoo: No quote data for {ticker}")
-                        return None
-                    
-                    quote = chart['indicators']['quote'][0]
-                    timestamps = chart.get('timestamp', [])
-                    
-                    # Filter out None values and get valid data
-                    closes = [c for c in quote.get('close', []) if c is not None]
-                    highs = [h for h in quote.get('high', []) if h is not None]
-                    lows = [l for l in quote.get('low', []) if l is not None]
-                    opens = [o for o in quote.get('open', []) if o is not None]
-                    volumes = [v for v in quote.get('volume', []) if v is not None]
-                    
-                    if not closes:
-                        print(f"   ⚠️  Yahoo: No valid price data for {ticker}")
-                        return None
-                    
-                    current_price = closes[-1]
-                    
-                    # Get the current market price from meta if available
-                    meta = chart.get('meta', {})
-                    if meta.get('regularMarketPrice'):
-                        current_price = meta['regularMarketPrice']
-                    
-                    return {
-                        'symbol': symbol,
-                        'current_price': current_price,
-                        'open': opens[-1] if opens else current_price,
-                        'high': highs[-1] if highs else current_price,
-                        'low': lows[-1] if lows else current_price,
-                        'close': current_price,
-                        'volume': volumes[-1] if volumes else 0,
-                        'high_52w': max(highs) if highs else current_price,
-                        'low_52w': min(lows) if lows else current_price,
-                        'change': current_price - opens[-1] if opens else 0,
-                        'pChange': ((current_price - opens[-1]) / opens[-1] * 100) if opens and opens[-1] else 0,
-                        'source': 'Yahoo Finance',
-                        'timestamp': datetime.now().isoformat(),
-                        'historical_closes': closes[-30:] if len(closes) >= 30 else closes  # Last 30 days for technical analysis
-                    }
-                    
+                    return self._parse_chart(symbol, ticker, response.json())
                 except json.JSONDecodeError:
                     print(f"   ❌ Yahoo: Invalid JSON response for {ticker}")
                     return None
@@ -369,24 +462,150 @@ class IntegratedMarketAnalyzer:
             print(f"   ❌ Yahoo fetch error for {symbol}: {str(e)}")
             return None
     
+    def _parse_chart(self, symbol: str, ticker: str, data: Dict) -> Optional[Dict]:
+        """Yahoo chart JSON -> price data dict (new bars are appended to the local history store)"""
+        # Check if the response has valid chart data
+        if not data.get('chart') or not data['chart'].get('result'):
+            print(f"   ⚠️  Yahoo: No chart data for {ticker}")
+            return None
+        
+        chart = data['chart']['result'][0]
+        
+        # Check if the chart has indicators
+        if not chart.get('indicators') or not chart['indicators'].get('quote'):
+            print(f"   ⚠️  Yahoo: No quote data for {ticker}")
+            return None
+        
+        meta = chart.get('meta', {})
+        bars = chart_bars(chart)
+        if bars['closes']:
+            self.history.append(symbol, bars, meta.get('gmtoffset', 0))
+        
+        # Price data always comes from the local store (new bars merged with stored history)
+        history = self.history.load(symbol, days=HISTORY_DAYS)
+        self.run_history[symbol] = history
+        
+        # Filter out None values and get valid data
+        closes = [c for c in history['closes'] if c is not None]
+        highs = [h for h in history['highs'] if h is not None]
+        lows = [l for l in history['lows'] if l is not None]
+        opens = [o for o in history['opens'] if o is not None]
+        volumes = [v for v in history['volumes'] if v is not None]
+        
+        if not closes:
+            print(f"   ⚠️  Yahoo: No valid price data for {ticker}")
+            return None
+        
+        current_price = closes[-1]
+        
+        # Get the current market price from meta if available
+        if meta.get('regularMarketPrice'):
+            current_price = meta['regularMarketPrice']
+        
+        return {
+            'symbol': symbol,
+            'current_price': current_price,
+            'open': opens[-1] if opens else current_price,
+            'high': highs[-1] if highs else current_price,
+            'low': lows[-1] if lows else current_price,
+            'close': current_price,
+            'volume': volumes[-1] if volumes else 0,
+            'high_52w': max(highs) if highs else current_price,
+            'low_52w': min(lows) if lows else current_price,
+            'change': current_price - opens[-1] if opens else 0,
+            'pChange': ((current_price - opens[-1]) / opens[-1] * 100) if opens and opens[-1] else 0,
+            'source': 'Yahoo Finance',
+            'timestamp': datetime.now().isoformat(),
+            'historical_closes': closes[-30:] if len(closes) >= 30 else closes,  # Last 30 days for technical analysis
+            # Highs / lows aligned with the closes (ATR)
+            'historical_highs': [h if h is not None else c for h, c in zip(history['highs'], history['closes'])][-30:],
+            'historical_lows': [l if l is not None else c for l, c in zip(history['lows'], history['closes'])][-30:]
+        }
+    
+    def get_history(self, symbol: str, days: int = HISTORY_DAYS) -> Dict[str, List]:
+        """
+        Daily bars for the last `days` calendar days from the per-run history cache
+        Loaded from the local store at most once per run (fetch_yahoo_data fills it first)
+        """
+        history = self.run_history.get(symbol)
+        if history is None:
+            history = self.history.load(symbol, days=HISTORY_DAYS)
+            if history['closes']:
+                self.run_history[symbol] = history
+        if days >= HISTORY_DAYS:
+            return history
+        
+        cutoff = int(time.time()) - days * 24 * 60 * 60
+        first = bisect.bisect_left(history['timestamps'], cutoff)
+        return {field: values[first:] for field, values in history.items()}
+    
+    def get_news_sentiment(self, symbol: str) -> Dict:
+        """
+        Latest available news sentiment with its age ('age_seconds', None if never fetched)
+        Background mode: read from the sentiment cache only; missing / stale symbols are
+        queued for the prefetcher. Inline mode: fetched (or served from cache) right here.
+        """
+        if self.news_prefetcher is None:
+            self.news_parser.get_combined_sentiment(symbol)
+        else:
+            self.news_prefetcher.start()
+            if self.news_parser.cache.get(symbol) is None:
+                self.news_prefetcher.request(symbol)
+        
+        entry = self.news_parser.cache.entry(symbol)
+        if entry is None:
+            sentiment = self.news_parser._empty_sentiment()
+            sentiment['age_seconds'] = None
+            return sentiment
+        
+        fetched_at, sentiment = entry
+        sentiment = dict(sentiment)
+        sentiment['age_seconds'] = round(max(0.0, time.time() - fetched_at))
+        return sentiment
+    
+    def _history_start(self, symbol: str) -> Optional[int]:
+        """Download start for an incremental chart request (None = full HISTORY_DAYS window)"""
+        last_ts = self.history.last_timestamp(symbol)
+        if last_ts is None:
+            return None
+        # Re-fetch the last stored day too - it may have been stored while still forming
+        return last_ts - 24 * 60 * 60
+    
+    def prefetch_prices(self, symbols: List[str], max_workers: int = 10):
+        """Download Yahoo charts for all symbols in one batch over the pooled client"""
+        starts = {symbol: self._history_start(symbol) for symbol in symbols}
+        starts = {symbol: start for symbol, start in starts.items() if start is not None}
+        charts = self.yahoo.download(symbols, days=HISTORY_DAYS, max_workers=max_workers, starts=starts)
+        for symbol, data in charts.items():
+            if data is None:
+                continue  # fetch_yahoo_data retries (and reports) on its own
+            try:
+                price_data = self._parse_chart(symbol, yahoo_ticker(symbol), data)
+            except Exception:
+                price_data = None
+            if price_data is not None:
+                self.prefetched_prices[symbol] = price_data
+    
     def fetch_fundamentals(self, symbol: str) -> Optional[Dict]:
+        """
+        Fundamentals from the local cache - never waits on Yahoo
+        Missing / stale entries are queued for the background refresher; a stale
+        value is still returned meanwhile (None only if the symbol was never fetched)
+        """
+        entry = self.fundamentals_cache.entry(symbol)
+        if entry is None or not self.fundamentals_cache.is_fresh(symbol):
+            self.fundamentals_refresher.request(symbol)
+        return entry[1] if entry else None
+    
+    def download_fundamentals(self, symbol: str) -> Optional[Dict]:
         """
         Fetch fundamentals from Yahoo Finance
         NSE doesn't provide fundamental data easily
         """
         try:
-            ticker = f"{symbol}.NS"
-            url = f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{ticker}"
-            params = {
-                'modules': 'financialData,defaultKeyStatistics'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
+            result = self.yahoo.quote_summary(f"{symbol}.NS", modules='financialData,defaultKeyStatistics')
             
-            if response.status_code == 200:
-                data = response.json()
-                result = data['quoteSummary']['result'][0]
-                
+            if result is not None:
                 financial = result.get('financialData', {})
                 stats = result.get('defaultKeyStatistics', {})
                 
@@ -404,7 +623,10 @@ class IntegratedMarketAnalyzer:
             return None
     
     def calculate_technical_indicators(self, data: Dict) -> Dict:
-        """Calculate RSI, moving averages, etc."""
+        """
+        Calculate RSI, moving averages, etc. (vectorized engine, one row)
+        Also seeds the symbol's streaming indicator state for update_technical()
+        """
         # Try to get historical closes from the data
         if 'historical_closes' in data:
             prices = data['historical_closes']
@@ -412,101 +634,80 @@ class IntegratedMarketAnalyzer:
             # Fallback to current price
             prices = [data.get('current_price', data.get('close', 0))]
         
-        if len(prices) < 2:
-            return {
-                'rsi': 50, 
-                'sma_10': prices[0] if prices else 0, 
-                'sma_20': prices[0] if prices else 0, 
-                'trend': 'SIDEWAYS'
-            }
-        
-        current_price = prices[-1]
-        
-        # RSI calculation (need at least 14 periods)
-        if len(prices) >= 14:
-            deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-            gains = [d if d > 0 else 0 for d in deltas]
-            losses = [-d if d < 0 else 0 for d in deltas]
-            
-            avg_gain = sum(gains[-14:]) / 14
-            avg_loss = sum(losses[-14:]) / 14
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-        else:
-            # Simple momentum calculation for shorter periods
-            if len(prices) >= 5:
-                recent_avg = sum(prices[-5:]) / 5
-                older_avg = sum(prices[:5]) / 5
-                if older_avg > 0:
-                    momentum = (recent_avg - older_avg) / older_avg
-                    rsi = 50 + (momentum * 100)  # Convert to RSI-like scale
-                    rsi = max(0, min(100, rsi))  # Clamp between 0 and 100
-                else:
-                    rsi = 50
-            else:
-                rsi = 50
-        
-        # Moving averages
-        sma_10 = sum(prices[-10:]) / min(10, len(prices))
-        sma_20 = sum(prices[-20:]) / min(20, len(prices))
-        
-        # Trend determination
-        if len(prices) >= 10:
-            recent_prices = prices[-5:]
-            older_prices = prices[-10:-5] if len(prices) >= 10 else prices[:-5]
-            
-            recent_avg = sum(recent_prices) / len(recent_prices)
-            older_avg = sum(older_prices) / len(older_prices) if older_prices else recent_avg
-            
-            if recent_avg > older_avg * 1.02:  # 2% threshold
-                trend = 'UPTREND'
-            elif recent_avg < older_avg * 0.98:  # 2% threshold
-                trend = 'DOWNTREND'
-            else:
-                trend = 'SIDEWAYS'
-        else:
-            trend = 'SIDEWAYS'
+        symbol = data.get('symbol')
+        if symbol:
+            self.indicator_states[symbol] = IndicatorState.from_history(prices)
         
-        return {
-            'rsi': round(rsi, 2),
-            'sma_10': round(sma_10, 2),
-            'sma_20': round(sma_20, 2),
-            'trend': trend
-        }
+        precomputed = self.precomputed_technical.pop(symbol, None)
+        if precomputed is not None and precomputed[0] is data:
+            return precomputed[1]
+        return self._technical_for({'_': dict(data, historical_closes=prices)})['_']
+    
+    def update_technical(self, symbol: str, close: float) -> Optional[Dict]:
+        """
+        Advance a symbol's indicators by one new bar in constant time (intraday loops)
+        Returns the updated indicators, or None if the symbol was never analyzed
+        """
+        state = self.indicator_states.get(symbol)
+        if state is None:
+            return None
+        return state.update(close).snapshot()
+    
+    def _technical_for(self, price_data_by_symbol: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Indicators for many price-data dicts in one vectorized pass"""
+        closes = {symbol: data['historical_closes'] for symbol, data in price_data_by_symbol.items()}
+        highs = {symbol: data.get('historical_highs', []) for symbol, data in price_data_by_symbol.items()}
+        lows = {symbol: data.get('historical_lows', []) for symbol, data in price_data_by_symbol.items()}
+        return universe_indicators(closes, highs_by_symbol=highs, lows_by_symbol=lows)
+    
+    def precompute_technical(self):
+        """Indicators for every prefetched symbol at once (consumed by calculate_technical_indicators)"""
+        prices = {symbol: data for symbol, data in self.prefetched_prices.items() if 'historical_closes' in data}
+        for symbol, technical in self._technical_for(prices).items():
+            self.precomputed_technical[symbol] = (prices[symbol], technical)
     
     def analyze_single_stock(self, symbol: str) -> Optional[Dict]:
         """Analyze a single stock with all data sources"""
         
-        # 1. Fetch price data (Yahoo Finance for fundamentals)
+        # 1. Fetch option chain data first (CRITICAL for F&O trading - no chain, no analysis)
+        option_chain = None
+        try:
+            option_chain = self.prefetched_chains.pop(symbol, None) or self.nse.get_option_chain(symbol)
+            if not option_chain or not option_chain.get('records', {}).get('data'):
+                # Skip stocks without F&O data completely
+                return None
+        except Exception as e:
+            # Skip stocks with option chain fetch errors
+            return None
+        
+        # Incremental mode: skip the full pipeline if nothing material changed since the last scan
+        fingerprint = None
+        if self.incremental:
+            fingerprint = ChainFingerprint.from_chain(option_chain, self.change_thresholds.atm_width)
+            previous_fingerprint, previous_result = self.previous_results.get(symbol, (None, None))
+            changed, reasons = material_change(previous_fingerprint, fingerprint, self.change_thresholds)
+            if not changed and previous_result is not None:
+                result = dict(previous_result)
+                result['reused'] = True
+                result['reuse_reason'] = 'No material option chain change'
+                self._categorize(result)
+                return result
+        
+        # 2. Fetch price data (Yahoo Finance for fundamentals)
         price_data = self.fetch_price_data(symbol)
         
         if not price_data:
             return None
         
-        # 2. Fetch fundamentals (Yahoo only)
+        # 3. Fundamentals (local cache, refreshed from Yahoo in the background)
         fundamentals = self.fetch_fundamentals(symbol)
         
-        # 3. Fetch news sentiment (Google + Yahoo News)
-        news_sentiment = self.news_parser.get_combined_sentiment(symbol)
+        # 4. News sentiment (Google + Yahoo News) - latest cached value, never waits in background mode
+        news_sentiment = self.get_news_sentiment(symbol)
         
-        # 4. Calculate technical indicators
+        # 5. Calculate technical indicators
         technical = self.calculate_technical_indicators(price_data)
         
-        # 5. Fetch option chain data (CRITICAL for F&O trading)
-        option_chain = None
-        try:
-            option_chain = self.nse.get_option_chain(symbol)
-            if not option_chain or not option_chain.get('records', {}).get('data'):
-                # Skip stocks without F&O data completely
-                return None
-        except Exception as e:
-            # Skip stocks with option chain fetch errors
-            return None
-        
         # 6. Calculate BASE confidence (50% weight from data)
         base_confidence = self.calculate_confidence(price_data, fundamentals, news_sentiment, technical, option_chain)
         
@@ -541,12 +742,53 @@ class IntegratedMarketAnalyzer:
             'fundamentals': fundamentals,
             'technical': technical,
             'news_sentiment': news_sentiment,
+            'news_age_seconds': news_sentiment.get('age_seconds'),
             'base_confidence': base_confidence,  # Show breakdown
             'confidence': final_confidence,  # Final confidence with backtesting adjustment
             'best_strategy': strategy
         }
         
+        # 10. Optional near / next / far expiry strategies from the same option chain
+        if self.expiry_labels:
+            result['expiry_strategies'] = self.analyze_expiries(
+                price_data, technical, base_confidence, symbol, option_chain, self.expiry_labels
+            )
+        
+        if self.incremental:
+            self.previous_results[symbol] = (fingerprint, result)
+        
         # Categorize
+        self._categorize(result)
+        
+        return result
+    
+    def analyze_expiries(self, price_data: Dict, technical: Dict, base_confidence: int, symbol: str,
+                         option_chain: Dict, labels: Tuple[str, ...] = EXPIRY_LABELS) -> Dict:
+        """
+        Strategy per expiry (near / next / far) from one downloaded chain
+        Each expiry is a view taken from the chain's expiry index - no extra NSE requests
+        Returns: {label: {'expiry', 'strategy', 'final_confidence'}}
+        """
+        expiries = OptionChain.of(option_chain).expiries()
+        results = {}
+        for label, expiry in zip(labels, expiries):
+            expiry_chain = expiry_option_chain(option_chain, expiry)
+            strategy = self.generate_strategy(price_data, technical, base_confidence, symbol, expiry_chain)
+            final_confidence = self.calculate_final_confidence(base_confidence, strategy, symbol, expiry_chain)
+            strategy['final_confidence'] = final_confidence
+            results[label] = {
+                'expiry': expiry,
+                'strategy': strategy,
+                'final_confidence': final_confidence
+            }
+        return results
+    
+    def _categorize(self, result: Dict):
+        """File a result under HIGH / MEDIUM / LOW confidence (and print approved HIGH strategies)"""
+        symbol = result['symbol']
+        strategy = result['best_strategy']
+        final_confidence = result['confidence']
+        
         with self.lock:
             if final_confidence >= 50:
                 self.high_confidence.append(result)
@@ -560,8 +802,6 @@ class IntegratedMarketAnalyzer:
                 self.medium_confidence.append(result)
             else:
                 self.low_confidence.append(result)
-        
-        return result
     
     def calculate_final_confidence(self, base_confidence: int, strategy: Dict, symbol: str, option_chain: Dict) -> int:
         """
@@ -700,298 +940,47 @@ class IntegratedMarketAnalyzer:
     
     def practical_strategy_backtest(self, symbol: str, strategy_type: str, current_price: float, 
                                    buy_strike: float, sell_strike: float, 
-                                   net_cost: float) -> Dict:
+                                   net_cost: float, horizon: int = backtest_kernels.DEFAULT_HORIZON,
+                                   pricing: Optional[str] = None) -> Dict:
         """
         Practical backtesting that tests directional accuracy and realistic breakeven scenarios
+        pricing: 'intrinsic' or 'black_scholes' (default: the analyzer's backtest_pricing)
         """
-        # Use integrated Yahoo Finance data fetching for backtesting
-        try:
-            import yfinance as yf
-            
-            # Convert symbol to Yahoo Finance format
-            if symbol in ['NIFTY', 'BANKNIFTY', 'FINNIFTY']:
-                ticker = symbol
-            else:
-                ticker = f"{symbol}.NS"
-            
-            # Get 30 days of historical data
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="30d")
-            
-            if hist.empty or len(hist) < 10:
-                return {'score': 42, 'verdict': 'NO_DATA', 'reason': 'Insufficient historical data'}
-            
-            # Convert to the format expected by backtesting methods
-            historical_data = {
-                'closes': hist['Close'].tolist(),
-                'highs': hist['High'].tolist(),
-                'lows': hist['Low'].tolist(),
-                'dates': hist.index.tolist()
-            }
-            
-        except ImportError:
-            return {'score': 42, 'verdict': 'NO_DATA', 'reason': 'yfinance not available'}
-        except Exception:
-            return {'score': 42, 'verdict': 'NO_DATA', 'reason': 'Data fetch failed'}
-        
-        # Strategy-specific backtesting logic
-        if strategy_type == 'Bull Call Spread':
-            return self._backtest_bull_call_spread(historical_data, buy_strike, sell_strike, net_cost)
-        elif strategy_type == 'Long Call':
-            return self._backtest_long_call(historical_data, buy_strike, net_cost)
-        elif strategy_type == 'Long Put':
-            return self._backtest_long_put(historical_data, buy_strike, net_cost)
-        elif strategy_type == 'Bear Put Spread':
-            return self._backtest_bear_put_spread(historical_data, buy_strike, sell_strike, net_cost)
-        elif strategy_type == 'Long Straddle':
-            return self._backtest_long_straddle(historical_data, buy_strike, net_cost)
-        elif strategy_type == 'Iron Condor':
-            return self._backtest_iron_condor(historical_data, buy_strike, sell_strike, net_cost)
-        else:
-            return {'score': 50, 'verdict': 'UNKNOWN', 'reason': f'Unknown strategy type: {strategy_type}'}
+        # Same bars fetch_yahoo_data loaded for this symbol - no second download
+        history = self.get_history(symbol, days=BACKTEST_DAYS)
+        if len(history['closes']) < BACKTEST_MIN_CLOSES:
+            return {'score': 42, 'verdict': 'NO_DATA', 'reason': 'Insufficient historical data'}
+        
+        if (pricing or self.backtest_pricing) == 'black_scholes':
+            # Same entry days; the older bars only warm up the realised volatility
+            full_history = self.get_history(symbol)
+            start = len(full_history['closes']) - len(history['closes'])
+            return backtest_kernels.premium_backtest(strategy_type, full_history['closes'], buy_strike, sell_strike,
+                                                     net_cost, horizon=horizon, start=start)
+        
+        # Strategy-specific backtesting logic (vectorized over every entry/exit scenario)
+        return backtest_kernels.backtest(strategy_type, history['closes'], buy_strike, sell_strike, net_cost,
+                                         horizon=horizon)
     
-    def _backtest_bull_call_spread(self, historical_data: Dict, buy_strike: float, sell_strike: float, net_cost: float) -> Dict:
-        """Backtest Bull Call Spread strategy"""
-        profitable_scenarios = 0
-        max_profit_scenarios = 0
-        directional_accuracy = 0
-        
-        results = []
-        total_scenarios = len(historical_data['closes']) - 5
-        
-        for i in range(total_scenarios):
-            entry_price = historical_data['closes'][i]
-            exit_price = historical_data['closes'][i + 5]  # 5 days later
-            
-            # Directional accuracy (bullish strategy expects upward move)
-            if exit_price > entry_price:
-                directional_accuracy += 1
-            
-            # Profit calculation
-            breakeven_price = buy_strike + net_cost
-            if exit_price >= sell_strike:
-                max_profit_scenarios += 1
-                profitable_scenarios += 1
-                profit = (sell_strike - buy_strike) - net_cost
-            elif exit_price >= breakeven_price:
-                profitable_scenarios += 1
-                profit = (exit_price - buy_strike) - net_cost
-            else:
-                profit = -net_cost
-            
-            results.append({
-                'entry': entry_price,
-                'exit': exit_price,
-                'profit': profit,
-                'profitable': profit > 0
-            })
-        
-        direction_pct = (directional_accuracy / total_scenarios * 100)
-        profit_pct = (profitable_scenarios / total_scenarios * 100)
-        overall_score = (direction_pct * 0.3) + (profit_pct * 0.7)
-        
-        if overall_score >= 65:
-            verdict = 'STRONG_BUY'
-        elif overall_score >= 40:
-            verdict = 'CAUTIOUS'
-        else:
-            verdict = 'AVOID'
-        
-        return {
-            'score': overall_score,
-            'verdict': verdict,
-            'direction_accuracy': direction_pct,
-            'profit_accuracy': profit_pct,
-            'scenarios_tested': total_scenarios,
-            'reason': f'{profit_pct:.1f}% profitable scenarios, {direction_pct:.1f}% directional accuracy'
-        }
-    
-    def _backtest_long_call(self, historical_data: Dict, strike: float, premium: float) -> Dict:
-        """Backtest Long Call strategy"""
-        profitable_scenarios = 0
-        directional_accuracy = 0
-        
-        total_scenarios = len(historical_data['closes']) - 5
-        
-        for i in range(total_scenarios):
-            entry_price = historical_data['closes'][i]
-            exit_price = historical_data['closes'][i + 5]
-            
-            if exit_price > entry_price:
-                directional_accuracy += 1
-            
-            # Long call profit = max(exit_price - strike, 0) - premium
-            breakeven = strike + premium
-            if exit_price >= breakeven:
-                profitable_scenarios += 1
-        
-        direction_pct = (directional_accuracy / total_scenarios * 100)
-        profit_pct = (profitable_scenarios / total_scenarios * 100)
-        overall_score = (direction_pct * 0.4) + (profit_pct * 0.6)
-        
-        verdict = 'STRONG_BUY' if overall_score >= 65 else 'CAUTIOUS' if overall_score >= 40 else 'AVOID'
-        
-        return {
-            'score': overall_score,
-            'verdict': verdict,
-            'direction_accuracy': direction_pct,
-            'profit_accuracy': profit_pct,
-            'scenarios_tested': total_scenarios,
-            'reason': f'{profit_pct:.1f}% profitable scenarios, {direction_pct:.1f}% directional accuracy'
-        }
-    
-    def _backtest_long_put(self, historical_data: Dict, strike: float, premium: float) -> Dict:
-        """Backtest Long Put strategy"""
-        profitable_scenarios = 0
-        directional_accuracy = 0
-        
-        total_scenarios = len(historical_data['closes']) - 5
-        
-        for i in range(total_scenarios):
-            entry_price = historical_data['closes'][i]
-            exit_price = historical_data['closes'][i + 5]
-            
-            if exit_price < entry_price:
-                directional_accuracy += 1
-            
-            # Long put profit = max(strike - exit_price, 0) - premium
-            breakeven = strike - premium
-            if exit_price <= breakeven:
-                profitable_scenarios += 1
-        
-        direction_pct = (directional_accuracy / total_scenarios * 100)
-        profit_pct = (profitable_scenarios / total_scenarios * 100)
-        overall_score = (direction_pct * 0.4) + (profit_pct * 0.6)
-        
-        verdict = 'STRONG_BUY' if overall_score >= 65 else 'CAUTIOUS' if overall_score >= 40 else 'AVOID'
-        
-        return {
-            'score': overall_score,
-            'verdict': verdict,
-            'direction_accuracy': direction_pct,
-            'profit_accuracy': profit_pct,
-            'scenarios_tested': total_scenarios,
-            'reason': f'{profit_pct:.1f}% profitable scenarios, {direction_pct:.1f}% directional accuracy'
-        }
-    
-    def _backtest_bear_put_spread(self, historical_data: Dict, buy_strike: float, sell_strike: float, net_cost: float) -> Dict:
-        """Backtest Bear Put Spread strategy"""
-        profitable_scenarios = 0
-        directional_accuracy = 0
-        
-        total_scenarios = len(historical_data['closes']) - 5
-        
-        for i in range(total_scenarios):
-            entry_price = historical_data['closes'][i]
-            exit_price = historical_data['closes'][i + 5]
-            
-            if exit_price < entry_price:
-                directional_accuracy += 1
-            
-            # Bear put spread profit calculation
-            breakeven_price = buy_strike - net_cost
-            if exit_price <= sell_strike:
-                profitable_scenarios += 1  # Max profit zone
-            elif exit_price <= breakeven_price:
-                profitable_scenarios += 1  # Some profit zone
-        
-        direction_pct = (directional_accuracy / total_scenarios * 100)
-        profit_pct = (profitable_scenarios / total_scenarios * 100)
-        overall_score = (direction_pct * 0.3) + (profit_pct * 0.7)
-        
-        verdict = 'STRONG_BUY' if overall_score >= 65 else 'CAUTIOUS' if overall_score >= 40 else 'AVOID'
-        
-        return {
-            'score': overall_score,
-            'verdict': verdict,
-            'direction_accuracy': direction_pct,
-            'profit_accuracy': profit_pct,
-            'scenarios_tested': total_scenarios,
-            'reason': f'{profit_pct:.1f}% profitable scenarios, {direction_pct:.1f}% directional accuracy'
-        }
-    
-    def _backtest_long_straddle(self, historical_data: Dict, strike: float, net_cost: float) -> Dict:
-        """Backtest Long Straddle strategy (profits from large moves in either direction)"""
-        profitable_scenarios = 0
-        volatility_scenarios = 0
-        
-        total_scenarios = len(historical_data['closes']) - 5
-        
-        for i in range(total_scenarios):
-            entry_price = historical_data['closes'][i]
-            exit_price = historical_data['closes'][i + 5]
-            
-            # Straddle profits from large moves in either direction
-            price_move = abs(exit_price - entry_price)
-            price_move_pct = (price_move / entry_price) * 100
-            
-            # Consider high volatility if move > 2%
-            if price_move_pct > 2.0:
-                volatility_scenarios += 1
-            
-            # Long straddle breakeven: strike ± net_cost
-            breakeven_up = strike + net_cost
-            breakeven_down = strike - net_cost
-            
-            if exit_price >= breakeven_up or exit_price <= breakeven_down:
-                profitable_scenarios += 1
-        
-        volatility_pct = (volatility_scenarios / total_scenarios * 100)
-        profit_pct = (profitable_scenarios / total_scenarios * 100)
-        overall_score = (volatility_pct * 0.4) + (profit_pct * 0.6)
-        
-        verdict = 'STRONG_BUY' if overall_score >= 65 else 'CAUTIOUS' if overall_score >= 40 else 'AVOID'
-        
-        return {
-            'score': overall_score,
-            'verdict': verdict,
-            'volatility_accuracy': volatility_pct,
-            'profit_accuracy': profit_pct,
-            'scenarios_tested': total_scenarios,
-            'reason': f'{profit_pct:.1f}% profitable scenarios, {volatility_pct:.1f}% high volatility periods'
-        }
-    
-    def _backtest_iron_condor(self, historical_data: Dict, center_strike: float, wing_width: float, net_credit: float) -> Dict:
-        """Backtest Iron Condor strategy (profits from low volatility/sideways movement)"""
-        profitable_scenarios = 0
-        low_volatility_scenarios = 0
-        
-        total_scenarios = len(historical_data['closes']) - 5
-        
-        # Iron Condor profit zone (between inner strikes)
-        lower_breakeven = center_strike - wing_width + net_credit
-        upper_breakeven = center_strike + wing_width - net_credit
-        
-        for i in range(total_scenarios):
-            entry_price = historical_data['closes'][i]
-            exit_price = historical_data['closes'][i + 5]
-            
-            # Iron Condor profits from sideways movement
-            price_move = abs(exit_price - entry_price)
-            price_move_pct = (price_move / entry_price) * 100
-            
-            # Consider low volatility if move < 1.5%
-            if price_move_pct < 1.5:
-                low_volatility_scenarios += 1
-            
-            # Profit if price stays within the profit zone
-            if lower_breakeven <= exit_price <= upper_breakeven:
-                profitable_scenarios += 1
-        
-        low_vol_pct = (low_volatility_scenarios / total_scenarios * 100)
-        profit_pct = (profitable_scenarios / total_scenarios * 100)
-        overall_score = (low_vol_pct * 0.4) + (profit_pct * 0.6)
-        
-        verdict = 'STRONG_BUY' if overall_score >= 65 else 'CAUTIOUS' if overall_score >= 40 else 'AVOID'
-        
-        return {
-            'score': overall_score,
-            'verdict': verdict,
-            'low_volatility_accuracy': low_vol_pct,
-            'profit_accuracy': profit_pct,
-            'scenarios_tested': total_scenarios,
-            'reason': f'{profit_pct:.1f}% profitable scenarios, {low_vol_pct:.1f}% low volatility periods'
-        }
+    def backtest_candidates(self, candidates: List[Dict], horizon: int = backtest_kernels.DEFAULT_HORIZON) -> List[Dict]:
+        """
+        practical_strategy_backtest for a whole table of candidates in one vectorized pass
+        candidates: dicts with symbol, strategy_type, buy_strike, sell_strike, net_cost
+        Returns one result per candidate (same values as practical_strategy_backtest)
+        Offline API (candidate tables, sweeps): the scan backtests each generated strategy
+        inline, because its net cost depends on that symbol's chain premiums
+        """
+        closes = {}
+        for symbol in dict.fromkeys(c['symbol'] for c in candidates):
+            history = self.get_history(symbol, days=BACKTEST_DAYS)
+            if len(history['closes']) >= BACKTEST_MIN_CLOSES:
+                closes[symbol] = history['closes']
+        
+        results = BatchBacktester(closes, horizon=horizon).results(CandidateTable.from_records(candidates))
+        for i, candidate in enumerate(candidates):
+            if candidate['symbol'] not in closes:
+                results[i] = {'score': 42, 'verdict': 'NO_DATA', 'reason': 'Insufficient historical data'}
+        return results
 
     def generate_strategy(self, price_data: Dict, technical: Dict, confidence: int, symbol: str, option_chain: Optional[Dict] = None) -> Dict:
         """
@@ -1031,57 +1020,32 @@ class IntegratedMarketAnalyzer:
             }
         
         # Calculate ATM strike
-        atm_strike = round(current_price / 50) * 50
+        atm_strike = atm_strike_for(current_price)
         
-        # IMPROVED Strategy selection - More practical conditions
-        
-        # Strong bullish signals
-        if (trend == 'UPTREND' and price_change > 0.5) or (price_change > 2):
-            if confidence >= 70:
-                return self.generate_long_call_strategy(current_price, atm_strike, option_chain)
-            else:
-                return self.generate_bull_call_spread(current_price, atm_strike, option_chain)
-                
-        # Strong bearish signals
-        elif (trend == 'DOWNTREND' and price_change < -0.5) or (price_change < -2):
-            if confidence >= 70:
-                return self.generate_long_put_strategy(current_price, atm_strike, option_chain)
-            else:
-                return self.generate_bear_put_spread(current_price, atm_strike, option_chain)
-                
-        # High volatility based on VOLUME, not price change
+        # IMPROVED Strategy selection - pure rules shared with the walk-forward backtest
         volume_volatility = self.check_volume_volatility(option_chain, symbol)
-        if volume_volatility == 'HIGH':
-            return self.generate_long_straddle(current_price, atm_strike, option_chain)
-                
-        # RSI-based strategies (more practical)
-        elif rsi > 65:  # Overbought (lower threshold)
-            return self.generate_bear_put_spread(current_price, atm_strike, option_chain)
-            
-        elif rsi < 35:  # Oversold (higher threshold) 
-            return self.generate_bull_call_spread(current_price, atm_strike, option_chain)
-            
-        # Neutral market with moderate confidence
-        elif confidence >= 60 and trend == 'SIDEWAYS' and abs(price_change) < 1.5:
-            return self.generate_iron_condor(current_price, atm_strike, option_chain)
-            
-        # Default strategy for moderate bullish conditions
-        elif confidence >= 50:
-            if price_change >= 0:  # Any positive movement
-                return self.generate_bull_call_spread(current_price, atm_strike, option_chain)
-            else:  # Negative movement
-                return self.generate_bear_put_spread(current_price, atm_strike, option_chain)
-        else:
-            # Default to watch if conditions are unclear
-            return {
-                'name': 'Watch',
-                'action': f'Unclear conditions - Monitor for better setup',
-                'investment': 0,
-                'max_profit': 0,
-                'max_loss': 0,
-                'risk_reward': 0,
-                    'outlook': 'Wait for clear signal'
-                }
+        strategy_type = select_strategy(trend, price_change, rsi, confidence, volume_volatility)
+        generators = {
+            'Long Call': self.generate_long_call_strategy,
+            'Bull Call Spread': self.generate_bull_call_spread,
+            'Long Put': self.generate_long_put_strategy,
+            'Bear Put Spread': self.generate_bear_put_spread,
+            'Long Straddle': self.generate_long_straddle,
+            'Iron Condor': self.generate_iron_condor,
+        }
+        if strategy_type in generators:
+            return generators[strategy_type](current_price, atm_strike, option_chain)
+        
+        # Default to watch if conditions are unclear
+        return {
+            'name': 'Watch',
+            'action': f'Unclear conditions - Monitor for better setup',
+            'investment': 0,
+            'max_profit': 0,
+            'max_loss': 0,
+            'risk_reward': 0,
+            'outlook': 'Wait for clear signal'
+        }
     
     def generate_bull_call_spread(self, spot_price: float, atm_strike: float, option_chain: Dict) -> Dict:
         """Bull Call Spread - Moderately bullish strategy with exact trade details"""
@@ -1561,7 +1525,7 @@ class IntegratedMarketAnalyzer:
         quantity = 2  # Fixed quantity for simplicity
         
         # Get expiry
-        expiry_date = "Oct-2025"  # Default expiry
+        expiry_date = self.get_option_expiry(option_chain)
         
         # Calculate totals
         total_credit = quantity * lot_size * net_credit_per_lot
@@ -1583,43 +1547,25 @@ class IntegratedMarketAnalyzer:
             'backtesting_result': backtesting_result
         }
     
+    def get_option_expiry(self, option_chain: Dict) -> str:
+        """Nearest expiry present in the option chain ('N/A' if unknown)"""
+        try:
+            expiries = OptionChain.of(option_chain).expiries()
+            return expiries[0] if expiries else 'N/A'
+        except Exception:
+            return 'N/A'
+    
     def get_option_data(self, option_chain: Dict, strike: float, option_type: str, spot_price: float) -> Dict:
-        """Extract comprehensive option data from option chain"""
+        """Extract comprehensive option data from option chain (bisect on the columnar strike index)"""
         try:
             if option_chain and 'records' in option_chain:
-                for record in option_chain['records'].get('data', []):
-                    if record.get('strikePrice') == strike:
-                        option_data = record.get(option_type, {})
-                        if option_data.get('lastPrice', 0) > 0:
-                            return {
-                                'lastPrice': option_data.get('lastPrice', 0),
-                                'bidPrice': option_data.get('bidprice', 0),
-                                'askPrice': option_data.get('askPrice', 0),
-                                'volume': option_data.get('totalTradedVolume', 0),
-                                'openInterest': option_data.get('openInterest', 0),
-                                'impliedVolatility': option_data.get('impliedVolatility', 0),
-                                'strike': strike,
-                                'type': option_type,
-                                'expiryDate': record.get('expiryDate', 'N/A')
-                            }
+                option_data = OptionChain.of(option_chain).find(strike, option_type)
+                if option_data:
+                    return option_data
             
             # Fallback data with approximate premium
-            moneyness = strike / spot_price
-            if option_type == 'CE':  # Call
-                if moneyness < 0.98:  # ITM
-                    premium = max(spot_price - strike + 20, 5)
-                elif moneyness > 1.02:  # OTM
-                    premium = max(10, 50 - (strike - spot_price))
-                else:  # ATM
-                    premium = 25
-            else:  # Put
-                if moneyness > 1.02:  # ITM
-                    premium = max(strike - spot_price + 20, 5)
-                elif moneyness < 0.98:  # OTM
-                    premium = max(10, 50 - (spot_price - strike))
-                else:  # ATM
-                    premium = 25
-                    
+            premium = fallback_premium(strike, option_type, spot_price)
+
             return {
                 'lastPrice': premium,
                 'bidPrice': premium * 0.95,
@@ -1658,26 +1604,12 @@ class IntegratedMarketAnalyzer:
         
         # Get total volume for ATM and nearby strikes
         spot_price = option_chain['records'].get('underlyingValue', 0)
-        atm_strike = round(spot_price / 50) * 50
+        atm_strike = atm_strike_for(spot_price)
         
-        total_volume = 0
-        total_oi = 0
-        strike_count = 0
-        
-        for record in option_chain['records'].get('data', []):
-            strike = record.get('strikePrice', 0)
-            if abs(strike - atm_strike) <= 200:  # Within 200 points of ATM
-                ce_data = record.get('CE', {})
-                pe_data = record.get('PE', {})
-                
-                ce_volume = ce_data.get('totalTradedVolume', 0)
-                pe_volume = pe_data.get('totalTradedVolume', 0)
-                ce_oi = ce_data.get('openInterest', 0)
-                pe_oi = pe_data.get('openInterest', 0)
-                
-                total_volume += ce_volume + pe_volume
-                total_oi += ce_oi + pe_oi
-                strike_count += 1
+        # Within 200 points of ATM (vector slice of the sorted strike index)
+        window = OptionChain.of(option_chain).window_totals(atm_strike, 200)
+        total_volume = window['call_volume'] + window['put_volume']
+        strike_count = window['strike_count']
         
         # Volume-based volatility thresholds
         avg_volume = total_volume / max(strike_count, 1)
@@ -1764,24 +1696,14 @@ class IntegratedMarketAnalyzer:
         # Option Chain Volume Analysis (20 points max) - NEW
         if option_chain and 'records' in option_chain:
             spot_price = option_chain['records'].get('underlyingValue', price_data.get('current_price', 0))
-            atm_strike = round(spot_price / 50) * 50
+            atm_strike = atm_strike_for(spot_price)
             
-            # Find ATM and nearby strikes
-            call_volume = 0
-            put_volume = 0
-            call_oi = 0
-            put_oi = 0
-            
-            for record in option_chain['records'].get('data', []):
-                strike = record.get('strikePrice', 0)
-                if abs(strike - atm_strike) <= 100:  # Within 100 points of ATM
-                    ce_data = record.get('CE', {})
-                    pe_data = record.get('PE', {})
-                    
-                    call_volume += ce_data.get('totalTradedVolume', 0)
-                    put_volume += pe_data.get('totalTradedVolume', 0)
-                    call_oi += ce_data.get('openInterest', 0)
-                    put_oi += pe_data.get('openInterest', 0)
+            # Find ATM and nearby strikes (within 100 points of ATM)
+            window = OptionChain.of(option_chain).window_totals(atm_strike, 100)
+            call_volume = window['call_volume']
+            put_volume = window['put_volume']
+            call_oi = window['call_oi']
+            put_oi = window['put_oi']
             
             # Volume analysis
             total_volume = call_volume + put_volume
@@ -1843,7 +1765,8 @@ class IntegratedMarketAnalyzer:
         
         return final_confidence
     
-    def analyze_all_parallel(self, symbols: List[str], max_workers: int = 10):
+    def analyze_all_parallel(self, symbols: List[str], max_workers: int = 10, prefetch_chains: bool = True,
+                             prefetch_prices: bool = True):
         """Analyze all symbols in parallel"""
         print(f"\n{'='*80}")
         print(f"🚀 PARALLEL ANALYSIS OF {len(symbols)} SYMBOLS")
@@ -1851,6 +1774,24 @@ class IntegratedMarketAnalyzer:
         print(f"   Threads: {max_workers}")
         print(f"{'='*80}\n")
         
+        # Download every option chain concurrently first - pacing comes from the NSE token bucket
+        if prefetch_chains:
+            self.prefetched_chains.update(self.nse.fetch_option_chains(symbols))
+        
+        # News for the whole universe refreshes in the background while the analysis runs
+        if self.news_prefetcher is not None:
+            self.news_prefetcher.start()
+        
+        # Stale fundamentals refresh in the background while the analysis runs
+        self.fundamentals_refresher.refresh_stale(symbols)
+        
+        # One batched Yahoo download (only symbols that have an option chain get analyzed)
+        if prefetch_prices:
+            price_symbols = [s for s in symbols if self.prefetched_chains.get(s)] if prefetch_chains else symbols
+            self.prefetch_prices(price_symbols, max_workers=max_workers)
+            # Indicators for the whole batch in one vectorized pass
+            self.precompute_technical()
+        
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {executor.submit(self.analyze_single_stock, symbol): symbol 
                       for symbol in symbols}
@@ -1868,7 +1809,6 @@ class IntegratedMarketAnalyzer:
                 except Exception as e:
                     # Silent error handling
                     pass
-                time.sleep(0.5)  # Rate limiting
     
     def save_results(self):
         """Save results to files"""
@@ -1921,6 +1861,8 @@ class IntegratedMarketAnalyzer:
                     f.write("NEWS SENTIMENT\n")
                     f.write(f"Momentum: {news['momentum']}\n")
                     f.write(f"Score: {news['score']}\n")
+                    if news.get('age_seconds') is not None:
+                        f.write(f"Age: {news['age_seconds'] // 60} min\n")
                     f.write("Recent Headlines:\n")
                     for headline in news['headlines'][:3]:
                         f.write(f"   • {headline}\n")
@@ -1983,8 +1925,8 @@ def main():
         print(f"🎯 Analyzing single symbol: {symbol}")
         print("="*80)
         
-        # Initialize
-        analyzer = IntegratedMarketAnalyzer()
+        # Initialize (one symbol - fetch its news inline rather than sweeping the universe)
+        analyzer = IntegratedMarketAnalyzer(background_news=False)
         
         # Analyze single symbol
         result = analyzer.analyze_single_stock(symbol)
@@ -2039,6 +1981,10 @@ def main():
         else:
             print(f"❌ Failed to analyze {symbol} - may not have F&O data")
         
+        # Let queued fundamentals downloads land in the cache for the next run
+        analyzer.fundamentals_refresher.wait(timeout=15)
+        analyzer.news_parser.flush()
+        analyzer.nse.close()
         return
     
     # Default: analyze all F&O symbols
@@ -2056,6 +2002,9 @@ def main():
     
     # Save results
     analyzer.save_results()
+    analyzer.fundamentals_refresher.wait(timeout=30)
+    analyzer.news_parser.flush()
+    analyzer.nse.close()
     
     # Final summary
     print(f"\n{'='*50}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Background News Prefetcher
+Keeps news sentiment for the F&O universe fresh in the local sentiment cache,
+off the analysis critical path. The analyzer only reads the latest cached
+sentiment (and records its age) - it never waits for Google / Yahoo News.
+- Scheduled sweeps refresh every symbol whose cached sentiment is older than the TTL
+- request(symbol) moves a symbol to the front (e.g. one the analyzer found missing)
+
+Usage (standalone daemon):
+  python news_prefetcher.py --interval 900
+"""
+
+import argparse
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+from fno_symbols import get_all_fno_symbols
+
+
+class NewsPrefetcher:
+    """Daemon thread refreshing cached sentiment on a schedule"""
+
+    def __init__(self, news_parser, symbols: Optional[Callable[[], List[str]]] = None,
+                 interval: float = 900, batch_size: int = 20):
+        self.news_parser = news_parser
+        self.symbols = symbols or get_all_fno_symbols
+        self.interval = interval  # seconds between sweeps
+        self.batch_size = batch_size  # symbols in flight per batch (paced by the per-host limiters)
+
+        self.last_sweep = None
+        self._requests = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'NewsPrefetcher':
+        """Start the background thread (no-op if already running)"""
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name='news-prefetcher')
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        self._requests.put(None)  # Wake the loop
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request(self, symbol: str):
+        """Refresh this symbol before the next scheduled sweep"""
+        self._requests.put(symbol.upper())
+
+    def stale_symbols(self, symbols: Optional[List[str]] = None) -> List[str]:
+        """Symbols with no sentiment younger than the cache TTL"""
+        symbols = symbols if symbols is not None else self.symbols()
+        return [symbol for symbol in symbols if self.news_parser.cache.get(symbol) is None]
+
+    def refresh(self, symbols: List[str]) -> int:
+        """Fetch sentiment for the given symbols (results land in the sentiment cache)"""
+        refreshed = 0
+        for start in range(0, len(symbols), self.batch_size):
+            if self._stop.is_set():
+                break
+            batch = symbols[start:start + self.batch_size]
+            try:
+                for _ in self.news_parser.stream_combined_sentiment(batch):
+                    refreshed += 1
+            except Exception as e:
+                print(f"⚠️  News prefetch error: {str(e)}")
+        self.news_parser.flush()
+        return refreshed
+
+    def refresh_stale(self) -> int:
+        """One sweep over the universe"""
+        refreshed = self.refresh(self.stale_symbols())
+        self.last_sweep = time.time()
+        return refreshed
+
+    def _drain_requests(self, first: Optional[str]) -> List[str]:
+        symbols = [first] if first else []
+        while True:
+            try:
+                symbol = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if symbol:
+                symbols.append(symbol)
+        return list(dict.fromkeys(symbols))
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.last_sweep is None or time.time() - self.last_sweep >= self.interval:
+                self.refresh_stale()
+                continue
+
+            # Between sweeps: serve on-demand requests until the next sweep is due
+            wait = max(0.0, self.interval - (time.time() - self.last_sweep))
+            try:
+                first = self._requests.get(timeout=wait)
+            except queue.Empty:
+                continue
+            requested = self.stale_symbols(self._drain_requests(first))
+            if requested:
+                self.refresh(requested)
+
+
+def main():
+    from market_analyzer_v5_integrated import NewsParser
+
+    parser = argparse.ArgumentParser(description='Keep F&O news sentiment fresh in the local cache')
+    parser.add_argument('--interval', type=float, default=900, help='seconds between sweeps')
+    parser.add_argument('--ttl', type=float, default=1800, help='sentiment younger than this is not re-fetched')
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--once', action='store_true', help='run one sweep and exit')
+    args = parser.parse_args()
+
+    prefetcher = NewsPrefetcher(NewsParser(cache_ttl=args.ttl), interval=args.interval, batch_size=args.batch_size)
+    if args.once:
+        print(f"📰 Refreshed sentiment for {prefetcher.refresh_stale()} symbols")
+        return
+
+    print(f"📰 News prefetcher running (sweep every {args.interval:.0f}s, TTL {args.ttl:.0f}s) - Ctrl+C to stop")
+    prefetcher.start()
+    try:
+        while prefetcher.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        prefetcher.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,28 @@ Based on proven working NSE Option Chain Analyzer
 Real implementation to fetch data from official NSE API sources
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import requests
 import json
+import threading
 import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from rate_limiter import TokenBucket
+from nse_session_pool import NSESessionPool
+from option_chain_cache import OptionChainCache
+from request_coalescer import RequestCoalescer
+from option_chain import expiry_option_chain
+import nse_json
+
 class NSEDataFetcher:
     """Clean NSE data fetcher using proven API endpoints"""
     
-    def __init__(self):
+    def __init__(self, requests_per_second: float = 3.0, cache_ttl: float = 60, cache_dir: Optional[str] = None,
+                 memo_ttl: float = 5.0):
         # Proven URLs from working analyzer
         self.url_oc = "https://www.nseindia.com/option-chain"
         self.url_index = "https://www.nseindia.com/api/option-chain-indices?symbol="
@@ -28,45 +40,63 @@ class NSEDataFetcher:
             'accept-encoding': 'gzip, deflate, br'
         }
         
-        # Initialize session
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        self.cookies = {}
+        # Thread-safe session pool: per-worker connections, shared cookies, single-flight refresh
+        self.sessions = NSESessionPool(self.headers, self.url_oc)
+        
+        # One global token bucket paces every option-chain request (threads and asyncio alike)
+        self.rate_limiter = TokenBucket(rate=requests_per_second)
+        
+        # On-disk option chain snapshots: fresh ones skip NSE, stale ones cover NSE outages
+        # (cache_ttl=0 always downloads but still keeps the outage fallback)
+        self.cache = OptionChainCache(ttl_seconds=cache_ttl, directory=cache_dir)
+        
+        # Single-flight per symbol + short memo: get_quote, analysis and strategy code share one download
+        self.coalescer = RequestCoalescer(memo_ttl=memo_ttl)
+        
+        # Worker threads of get_option_chains_async, kept across scans so their sessions are reused
+        self._executor = None
+        self._executor_workers = 0
+        self._executor_lock = threading.Lock()
         
         # Initialize session by getting cookies
         self._init_session()
     
+    @property
+    def session(self) -> requests.Session:
+        """Session owned by the calling worker thread"""
+        return self.sessions.session()
+    
+    @property
+    def cookies(self) -> Dict[str, str]:
+        """NSE cookies shared by all workers"""
+        return self.sessions.cookies
+    
     def _init_session(self):
         """Initialize session with NSE Option Chain page to get cookies (proven method)"""
         try:
             print("📡 Initializing NSE session...")
             
             # Visit option-chain page to get cookies (proven working method)
-            request = self.session.get(self.url_oc, headers=self.headers, timeout=5)
-            self.cookies = dict(request.cookies)
+            self.sessions.refresh()
             
-            if request.status_code == 200:
+            if self.cookies:
                 print("✅ NSE session initialized with cookies")
-                return True
             else:
-                print(f"⚠️  NSE session returned {request.status_code}")
-                return True  # Continue anyway
+                print("⚠️  NSE session returned no cookies")
+            return True  # Continue anyway
                 
         except Exception as e:
             print(f"⚠️  NSE session initialization error: {str(e)}")
-            self.cookies = {}
             return True
     
-    def _refresh_session(self):
-        """Refresh session cookies when needed"""
+    def _refresh_session(self, seen_generation: Optional[int] = None):
+        """Refresh session cookies when needed (only one worker refreshes, the rest wait for it)"""
         try:
             print("🔄 Refreshing NSE session...")
-            request = self.session.get(self.url_oc, headers=self.headers, timeout=5)
-            self.cookies = dict(request.cookies)
-            print("✅ Session cookies refreshed")
+            if self.sessions.refresh(seen_generation):
+                print("✅ Session cookies refreshed")
         except Exception as e:
             print(f"⚠️  Failed to refresh session: {str(e)}")
-            self.cookies = {}
     
     def get_symbols(self) -> Dict[str, List[str]]:
         """
@@ -76,7 +106,7 @@ class NSEDataFetcher:
         Returns: Dict with 'indices' and 'stocks' lists
         """
         try:
-            response = self.session.get(self.url_symbols, headers=self.headers, timeout=5, cookies=self.cookies)
+            response = self.sessions.get(self.url_symbols, timeout=5)
             
             if response.status_code == 200:
                 json_data = response.json()
@@ -106,6 +136,54 @@ class NSEDataFetcher:
         Method: Direct JSON API call with session cookies (proven working method)
         Data: Complete option chain with CE/PE data, underlying price, volumes
         Cost: FREE - official NSE API
+        Cache: snapshots younger than cache_ttl are served from disk
+        Coalescing: concurrent / back-to-back calls for one symbol share a single download and parse
+        """
+        return self.coalescer.do(symbol.upper(), lambda: self._load_option_chain(symbol))
+    
+    @staticmethod
+    def _compact_key(symbol: str, expiry_date: Optional[str] = None):
+        """Coalescer key of a compact single-expiry download (None: nearest expiry)"""
+        return symbol.upper(), 'compact', expiry_date
+    
+    def _load_option_chain(self, symbol: str) -> Optional[Dict]:
+        """Disk snapshot if fresh, otherwise a rate-limited NSE download"""
+        cached = self.cache.get(symbol)
+        if cached is not None:
+            return cached
+        
+        return self._paced_download(symbol)
+    
+    def _paced_download(self, symbol: str) -> Optional[Dict]:
+        """Download once a slot in the shared rate limit is free (run inside the coalescer,
+        so callers that join an in-flight download are not charged a token)"""
+        # Wait for a slot in the shared rate limit instead of a fixed sleep
+        self.rate_limiter.acquire()
+        return self._download_option_chain(symbol)
+    
+    def _download_option_chain(self, symbol: str) -> Optional[Dict]:
+        """Fetch from NSE and snapshot the result; fall back to the last snapshot if NSE fails"""
+        option_chain = self._fetch_option_chain(symbol)
+        
+        if option_chain is not None:
+            self.cache.put(symbol, option_chain)
+            return option_chain
+        
+        snapshot = self.cache.latest(symbol)
+        if snapshot:
+            fetched_at, option_chain = snapshot
+            age = time.time() - fetched_at
+            print(f"⚠️  NSE unavailable for {symbol} - using cached snapshot from {age:.0f}s ago")
+            return option_chain
+        
+        return None
+    
+    def _fetch_option_chain(self, symbol: str, compact: bool = False, expiry: Optional[str] = None) -> Optional[Dict]:
+        """
+        Download and validate one option chain (caller is responsible for rate limiting)
+        
+        compact: decode only the analyzer's fields for one expiry (expiry, or the nearest one)
+                 instead of building the full dict tree for every expiry
         """
         try:
             # Determine if symbol is index or stock (proven detection method)
@@ -118,23 +196,17 @@ class NSEDataFetcher:
             else:
                 url = f"{self.url_stock}{symbol}"
             
-            # Add delay to avoid rate limiting (proven timing)
-            time.sleep(0.5)
-            
-            # Make API request with cookies (proven method)
-            response = self.session.get(url, headers=self.headers, timeout=10, cookies=self.cookies)
-            
-            # Handle 401 (unauthorized) by refreshing session (proven error handling)
-            if response.status_code == 401:
-                print("🔄 Session expired, refreshing cookies...")
-                self._refresh_session()
-                response = self.session.get(url, headers=self.headers, timeout=10, cookies=self.cookies)
+            # Make API request with shared cookies - a 401 triggers one pooled refresh and a retry
+            response = self.sessions.get(url, timeout=10)
             
             if response.status_code == 200:
-                json_data = response.json()
+                if compact:
+                    json_data = nse_json.decode_option_chain(response.content, expiry=expiry, nearest_expiry=True)
+                else:
+                    json_data = nse_json.loads(response.content)
                 
                 # Validate response structure (proven validation)
-                if 'records' in json_data and 'data' in json_data['records']:
+                if json_data and 'records' in json_data and 'data' in json_data['records']:
                     num_strikes = len(json_data['records']['data'])
                     print(f"✅ Fetched option chain for {symbol} with {num_strikes} strikes")
                     return json_data
@@ -149,6 +221,57 @@ class NSEDataFetcher:
             print(f"❌ Error fetching option chain for {symbol}: {str(e)}")
             return None
     
+    async def get_option_chains_async(self, symbols: List[str], max_concurrency: int = 10) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch many option chains concurrently
+        
+        Requests go out as fast as the shared token bucket allows (not a fixed per-request sleep),
+        with at most max_concurrency downloads in flight at once.
+        Returns: Dict of symbol -> option chain (None for failed symbols)
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        executor = self._worker_pool(max_concurrency)
+        
+        async def fetch(symbol: str):
+            async with semaphore:
+                key = symbol.upper()
+                recent = self.coalescer.recent(key)
+                if recent is not None:
+                    return symbol, recent
+                cached = await loop.run_in_executor(executor, self.cache.get, symbol)
+                if cached is not None:
+                    return symbol, cached
+                download = functools.partial(self._paced_download, symbol)
+                return symbol, await loop.run_in_executor(executor, self.coalescer.do, key, download)
+        
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        return dict(results)
+    
+    def _worker_pool(self, max_workers: int) -> concurrent.futures.ThreadPoolExecutor:
+        """Long-lived download threads (grown, never shrunk, when a call asks for more workers)"""
+        with self._executor_lock:
+            if self._executor is None or self._executor_workers < max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                                       thread_name_prefix='nse-fetch')
+                self._executor_workers = max_workers
+            return self._executor
+    
+    def close(self):
+        """Stop the download threads and close every pooled NSE session"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._executor_workers = 0
+        self.sessions.close()
+    
+    def fetch_option_chains(self, symbols: List[str], max_concurrency: int = 10) -> Dict[str, Optional[Dict]]:
+        """Synchronous entry point for get_option_chains_async (runs its own event loop)"""
+        return asyncio.run(self.get_option_chains_async(symbols, max_concurrency))
+    
     def get_quote(self, symbol: str) -> Optional[Dict]:
         """
         Get real-time stock quote from NSE using option chain API
@@ -158,8 +281,10 @@ class NSEDataFetcher:
         Cost: FREE - official NSE API
         """
         try:
-            # Get option chain data which contains underlying price (proven method)
-            option_data = self.get_option_chain(symbol)
+            # Get option chain data which contains underlying price (proven method);
+            # a compact chain from get_option_data_for_analysis carries it as well
+            option_data = self.coalescer.do(symbol.upper(), lambda: self._load_option_chain(symbol),
+                                            share=(self._compact_key(symbol),))
             
             if option_data and 'records' in option_data:
                 records = option_data['records']
@@ -218,14 +343,30 @@ class NSEDataFetcher:
             print(f"❌ Error fetching quote for {symbol}: {str(e)}")
             return None
     
+    def _fetch_compact_option_chain(self, symbol: str, expiry_date: Optional[str]) -> Optional[Dict]:
+        """Rate-limited compact download for one expiry (not written to the snapshot cache)"""
+        self.rate_limiter.acquire()
+        return self._fetch_option_chain(symbol, compact=True, expiry=expiry_date)
+    
     def get_option_data_for_analysis(self, symbol: str, expiry_date: str = None) -> Optional[Dict]:
         """
         Get formatted option data for market analysis
         
         Returns: Formatted data ready for strategy analysis
+        Reuses a full chain that is memoized, in flight or snapshotted; otherwise
+        downloads a compact single-expiry decode, shared with get_quote
+        (falls back to the full chain path if that fails)
         """
         try:
-            option_chain = self.get_option_chain(symbol)
+            option_chain = self.cache.get(symbol)
+            if option_chain is None:
+                option_chain = self.coalescer.do(
+                    self._compact_key(symbol, expiry_date),
+                    lambda: self._fetch_compact_option_chain(symbol, expiry_date),
+                    share=(symbol.upper(),)
+                )
+            if option_chain is None:
+                option_chain = self.get_option_chain(symbol)
             
             if not option_chain or 'records' not in option_chain:
                 return None
@@ -247,20 +388,11 @@ class NSEDataFetcher:
             if not expiry_date and expiry_dates:
                 expiry_date = expiry_dates[0]  # Use nearest expiry
             
-            # Filter data for specific expiry
-            filtered_data = []
-            for record in records.get('data', []):
-                ce_data = record.get('CE', {})
-                pe_data = record.get('PE', {})
-                
-                # Check if this record matches our expiry
-                ce_expiry = ce_data.get('expiryDate', '')
-                pe_expiry = pe_data.get('expiryDate', '')
-                
-                if expiry_date and (ce_expiry == expiry_date or pe_expiry == expiry_date):
-                    filtered_data.append(record)
-                elif not expiry_date:  # Include all if no specific expiry requested
-                    filtered_data.append(record)
+            # Records for one expiry come from the chain's expiry index
+            if expiry_date:
+                filtered_data = expiry_option_chain(option_chain, expiry_date)['records']['data']
+            else:  # Include all if no specific expiry requested
+                filtered_data = list(records.get('data', []))
             
             analysis_data = {
                 'symbol': symbol,
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Fast NSE JSON Decoding
+- loads(): orjson when installed, stdlib json otherwise
+- decode_option_chain(): compact decode of an option-chain response that keeps only
+  the fields and expiries the analyzer uses (parsed in full, pruned straight away)
+"""
+
+import json
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Per-leg fields read by the analyzer, get_quote and the strategy generators
+LEG_FIELDS = (
+    'strikePrice', 'expiryDate', 'underlying', 'underlyingValue',
+    'lastPrice', 'bidprice', 'askPrice', 'openInterest', 'changeinOpenInterest',
+    'totalTradedVolume', 'impliedVolatility'
+)
+
+
+def loads(raw: bytes):
+    """Decode a JSON payload with the fastest available parser"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _compact_record(record: Dict, expiry: Optional[str]) -> Optional[Dict]:
+    """Record reduced to the analyzer's fields, or None if it belongs to another expiry"""
+    ce = record.get('CE')
+    pe = record.get('PE')
+    record_expiry = record.get('expiryDate') or (ce or {}).get('expiryDate') or (pe or {}).get('expiryDate')
+    if expiry and record_expiry != expiry:
+        return None
+
+    compact = {'strikePrice': record.get('strikePrice'), 'expiryDate': record_expiry}
+    for side, leg in (('CE', ce), ('PE', pe)):
+        if leg:
+            compact[side] = {field: leg[field] for field in LEG_FIELDS if field in leg}
+    return compact
+
+
+def _build(expiry_dates: List[str], underlying_value, timestamp, data: List[Dict]) -> Dict:
+    return {
+        'records': {
+            'expiryDates': expiry_dates,
+            'underlyingValue': underlying_value,
+            'timestamp': timestamp,
+            'data': data
+        }
+    }
+
+
+def decode_option_chain(raw: bytes, expiry: Optional[str] = None, nearest_expiry: bool = False) -> Optional[Dict]:
+    """
+    Decode an NSE option-chain payload into the same {'records': {...}} shape, compacted
+
+    expiry:         keep only records of this expiry
+    nearest_expiry: when no expiry is given, keep only the first entry of expiryDates
+    Returns None for payloads without records.data
+    """
+    json_data = loads(raw)
+    records = json_data.get('records') if isinstance(json_data, dict) else None
+    if not records or 'data' not in records:
+        return None
+
+    expiry_dates = records.get('expiryDates', [])
+    if not expiry and nearest_expiry and expiry_dates:
+        expiry = expiry_dates[0]
+
+    data = []
+    for record in records['data']:
+        compact = _compact_record(record, expiry)
+        if compact is not None:
+            data.append(compact)
+
+    return _build(expiry_dates, records.get('underlyingValue', 0), records.get('timestamp'), data)
+
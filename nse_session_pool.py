@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Thread-safe NSE Session Pool
+- One requests.Session per worker thread (keep-alive connections are reused per worker);
+  sessions of finished threads are closed when the next worker joins
+- One shared cookie jar for all workers
+- Single-flight cookie refresh: when many workers hit 401 together, exactly one
+  reloads the option-chain page while the others wait and reuse its cookies
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+
+from http_transport import new_session
+
+
+class NSESessionPool:
+    """Per-thread sessions sharing one set of NSE cookies"""
+
+    def __init__(self, headers: Dict[str, str], cookie_url: str, cookie_timeout: int = 5):
+        self.headers = headers
+        self.cookie_url = cookie_url
+        self.cookie_timeout = cookie_timeout
+
+        self._local = threading.local()
+        self._sessions = {}  # thread -> session
+        self._sessions_lock = threading.Lock()
+
+        # Cookies are replaced as a whole, never mutated, so readers only need the reference
+        self._cookies = {}
+        self._generation = 0
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        """Current shared cookies"""
+        return self._cookies
+
+    @property
+    def generation(self) -> int:
+        """Incremented every time the cookies are refreshed"""
+        return self._generation
+
+    def session(self) -> requests.Session:
+        """Session owned by the calling thread (created on first use)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = new_session()
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._sessions_lock:
+                self._prune_locked()
+                self._sessions[threading.current_thread()] = session
+        return session
+
+    def _prune_locked(self):
+        """Close the sessions of threads that have exited (short-lived executors)"""
+        for thread in [thread for thread in self._sessions if not thread.is_alive()]:
+            self._sessions.pop(thread).close()
+
+    def __len__(self) -> int:
+        """Open worker sessions"""
+        with self._sessions_lock:
+            self._prune_locked()
+            return len(self._sessions)
+
+    def refresh(self, seen_generation: Optional[int] = None) -> bool:
+        """
+        Reload cookies from the NSE option-chain page (single-flight)
+
+        seen_generation: generation the caller used for its failed request. If another
+        worker refreshed in the meantime, the caller just picks up the new cookies.
+        Returns True if this call performed the refresh.
+        """
+        with self._refresh_lock:
+            if seen_generation is not None and seen_generation != self._generation:
+                return False
+            try:
+                response = self.session().get(self.cookie_url, headers=self.headers, timeout=self.cookie_timeout)
+                self._cookies = dict(response.cookies)
+                self._generation += 1
+                return True
+            except Exception:
+                self._cookies = {}
+                self._generation += 1
+                raise
+
+    def get(self, url: str, timeout: int = 10) -> requests.Response:
+        """GET with shared cookies; a 401 triggers one (shared) cookie refresh and a retry"""
+        generation = self._generation
+        response = self.session().get(url, headers=self.headers, timeout=timeout, cookies=self._cookies)
+
+        if response.status_code == 401:
+            print("🔄 Session expired, refreshing cookies...")
+            try:
+                self.refresh(seen_generation=generation)
+            except Exception as e:
+                print(f"⚠️  Failed to refresh session: {str(e)}")
+            response = self.session().get(url, headers=self.headers, timeout=timeout, cookies=self._cookies)
+
+        return response
+
+    def close(self):
+        """Close every worker session"""
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
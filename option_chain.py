@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Columnar Option Chain
+NSE option-chain JSON parsed once into NumPy arrays
+- One row per NSE record (strike + expiry), CE and PE columns side by side
+- Rows sorted by strike (original record order kept within a strike)
+- Strike lookups by bisect, ATM-window statistics by vector slice
+- Expiry index built once: every expiry in one NSE response is a strike-sorted sub-chain
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# NSE field name -> column suffix
+_SIDE_FIELDS = {
+    'lastPrice': 'ltp',
+    'bidprice': 'bid',
+    'askPrice': 'ask',
+    'openInterest': 'oi',
+    'totalTradedVolume': 'volume',
+    'impliedVolatility': 'iv',
+}
+
+
+def _number(value) -> float:
+    """NSE numeric field -> float (missing / null -> 0)"""
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class OptionChain:
+    """NumPy-backed option chain with a sorted strike index"""
+
+    # Parsed chains memoized by the identity of their source dict (the dict is kept alive with it)
+    _views = OrderedDict()
+    _views_lock = Lock()
+    _max_views = 64
+
+    def __init__(self, strike: np.ndarray, expiry: np.ndarray, columns: Dict[str, np.ndarray],
+                 underlying_value: float = 0.0, expiry_dates: Optional[List[str]] = None,
+                 record_index: Optional[np.ndarray] = None):
+        self.strike = strike
+        self.expiry = expiry
+        self.columns = columns
+        self.underlying_value = underlying_value
+        self.expiry_dates = list(expiry_dates or [])
+        # Position of each row in the source records.data list
+        self.record_index = record_index if record_index is not None else np.arange(len(strike))
+        self._expiry_rows = None
+        self._expiry_chains = {}
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    @classmethod
+    def from_nse(cls, option_chain: Dict) -> 'OptionChain':
+        """Parse an NSE option-chain response (or any dict with records.data)"""
+        records = (option_chain or {}).get('records', {}) or {}
+        data = records.get('data', []) or []
+        n = len(data)
+
+        strike = np.empty(n, dtype=np.float64)
+        expiry = np.empty(n, dtype=object)
+        columns = {f'{side}_{suffix}': np.zeros(n, dtype=np.float64)
+                   for side in ('ce', 'pe') for suffix in _SIDE_FIELDS.values()}
+        columns['ce_present'] = np.zeros(n, dtype=bool)
+        columns['pe_present'] = np.zeros(n, dtype=bool)
+
+        for i, record in enumerate(data):
+            strike[i] = _number(record.get('strikePrice', 0))
+            ce = record.get('CE') or {}
+            pe = record.get('PE') or {}
+            expiry[i] = record.get('expiryDate') or ce.get('expiryDate') or pe.get('expiryDate') or ''
+            for side, leg in (('ce', ce), ('pe', pe)):
+                if not leg:
+                    continue
+                columns[f'{side}_present'][i] = True
+                for field, suffix in _SIDE_FIELDS.items():
+                    columns[f'{side}_{suffix}'][i] = _number(leg.get(field, 0))
+
+        # Stable sort keeps NSE record order within a strike (first-match semantics of the old scan)
+        order = np.argsort(strike, kind='stable')
+        return cls(
+            strike=strike[order],
+            expiry=expiry[order],
+            columns={name: column[order] for name, column in columns.items()},
+            underlying_value=_number(records.get('underlyingValue', 0)),
+            expiry_dates=records.get('expiryDates', []),
+            record_index=order,
+        )
+
+    @classmethod
+    def of(cls, option_chain: Dict) -> 'OptionChain':
+        """Columnar view of an option-chain dict, parsed at most once per dict"""
+        if isinstance(option_chain, OptionChain):
+            return option_chain
+        key = id(option_chain)
+        with cls._views_lock:
+            entry = cls._views.get(key)
+            if entry is not None and entry[0] is option_chain:
+                cls._views.move_to_end(key)
+                return entry[1]
+
+        chain = cls.from_nse(option_chain)
+        cls._remember(option_chain, chain)
+        return chain
+
+    @classmethod
+    def _remember(cls, option_chain: Dict, chain: 'OptionChain'):
+        with cls._views_lock:
+            cls._views[id(option_chain)] = (option_chain, chain)
+            while len(cls._views) > cls._max_views:
+                cls._views.popitem(last=False)
+
+    def expiry_rows(self) -> Dict[str, np.ndarray]:
+        """Expiry -> row positions (strike-sorted), built once per chain"""
+        if self._expiry_rows is None:
+            codes, inverse = np.unique(self.expiry.astype(str), return_inverse=True)
+            rows = {str(code): np.flatnonzero(inverse == i) for i, code in enumerate(codes)}
+            self._expiry_rows = rows
+        return self._expiry_rows
+
+    def expiries(self) -> List[str]:
+        """Expiries present in the chain, in NSE's expiryDates order (nearest first)"""
+        present = self.expiry_rows()
+        ordered = [e for e in self.expiry_dates if e in present]
+        return ordered + sorted(e for e in present if e not in ordered and e)
+
+    def for_expiry(self, expiry: str) -> 'OptionChain':
+        """Columnar sub-chain holding only one expiry (shares nothing mutable with the parent)"""
+        rows = self.expiry_rows().get(expiry, np.empty(0, dtype=np.int64))
+        return OptionChain(
+            strike=self.strike[rows],
+            expiry=self.expiry[rows],
+            columns={name: column[rows] for name, column in self.columns.items()},
+            underlying_value=self.underlying_value,
+            expiry_dates=[expiry],
+            record_index=self.record_index[rows],
+        )
+
+
+    def strike_slice(self, low: float, high: float) -> slice:
+        """Rows with low <= strike <= high"""
+        start = int(np.searchsorted(self.strike, low, side='left'))
+        stop = int(np.searchsorted(self.strike, high, side='right'))
+        return slice(start, stop)
+
+    def find(self, strike: float, option_type: str) -> Optional[Dict]:
+        """
+        First record at this strike with a traded price for CE/PE
+        Returns the same shape as IntegratedMarketAnalyzer.get_option_data, or None
+        """
+        side = 'ce' if option_type == 'CE' else 'pe'
+        rows = self.strike_slice(strike, strike)
+        if rows.start == rows.stop:
+            return None
+
+        ltp = self.columns[f'{side}_ltp'][rows]
+        hits = np.flatnonzero(ltp > 0)
+        if len(hits) == 0:
+            return None
+
+        i = rows.start + int(hits[0])
+        return {
+            'lastPrice': float(self.columns[f'{side}_ltp'][i]),
+            'bidPrice': float(self.columns[f'{side}_bid'][i]),
+            'askPrice': float(self.columns[f'{side}_ask'][i]),
+            'volume': int(self.columns[f'{side}_volume'][i]),
+            'openInterest': int(self.columns[f'{side}_oi'][i]),
+            'impliedVolatility': float(self.columns[f'{side}_iv'][i]),
+            'strike': strike,
+            'type': option_type,
+            'expiryDate': self.expiry[i] or 'N/A'
+        }
+
+    def window_totals(self, center: float, width: float) -> Dict:
+        """Volume / OI totals for records with |strike - center| <= width"""
+        rows = self.strike_slice(center - width, center + width)
+        return {
+            'call_volume': float(self.columns['ce_volume'][rows].sum()),
+            'put_volume': float(self.columns['pe_volume'][rows].sum()),
+            'call_oi': float(self.columns['ce_oi'][rows].sum()),
+            'put_oi': float(self.columns['pe_oi'][rows].sum()),
+            'strike_count': rows.stop - rows.start
+        }
+
+
+
+def expiry_option_chain(option_chain: Dict, expiry: str) -> Dict:
+    """
+    NSE-shaped dict holding only one expiry of option_chain
+    The records are picked through the expiry index (no per-record field filtering),
+    and the matching columnar view is pre-registered so OptionChain.of() never re-parses it.
+    """
+    parent = OptionChain.of(option_chain)
+    cached = parent._expiry_chains.get(expiry)
+    if cached is not None:
+        return cached
+
+    sub_chain = parent.for_expiry(expiry)
+    records = option_chain.get('records', {})
+    data = records.get('data', [])
+    # Keep NSE's original record order within the expiry
+    positions = np.sort(sub_chain.record_index)
+    sub_records = {key: value for key, value in records.items() if key != 'data'}
+    sub_records['expiryDates'] = [expiry]
+    sub_records['data'] = [data[i] for i in positions]
+    sub_dict = {'records': sub_records}
+
+    OptionChain._remember(sub_dict, sub_chain)
+    parent._expiry_chains[expiry] = sub_dict
+    return sub_dict
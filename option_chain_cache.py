@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Option Chain Snapshot Cache
+Persistent on-disk snapshots of NSE option chains, keyed by symbol and fetch time
+- Fresh snapshots (younger than the TTL) are served without touching NSE
+- The latest snapshot of any age is kept as a fallback when NSE is unreachable
+Layout: <cache root>/option_chains/<SYMBOL>/<fetched_at_ms>.json
+"""
+
+import os
+import time
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from local_store import cache_dir, read_json, write_json_atomic
+
+
+class OptionChainCache:
+    """On-disk option chain snapshots with a configurable TTL"""
+
+    def __init__(self, ttl_seconds: float = 60, directory: Optional[str] = None, max_snapshots: int = 5):
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory or cache_dir('option_chains')
+        self.max_snapshots = max_snapshots
+        self._lock = Lock()
+
+    def _symbol_dir(self, symbol: str, create: bool = False) -> str:
+        path = os.path.join(self.directory, symbol.upper())
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def _snapshot_times(self, symbol: str) -> List[int]:
+        """Fetch times (ms) of stored snapshots, newest first"""
+        try:
+            names = os.listdir(self._symbol_dir(symbol))
+        except OSError:
+            return []
+        times = [int(name[:-5]) for name in names if name.endswith('.json') and name[:-5].isdigit()]
+        return sorted(times, reverse=True)
+
+    def latest(self, symbol: str) -> Optional[Tuple[float, Dict]]:
+        """Newest snapshot regardless of age: (fetched_at epoch seconds, option chain)"""
+        for fetched_ms in self._snapshot_times(symbol):
+            data = read_json(os.path.join(self._symbol_dir(symbol), f"{fetched_ms}.json"))
+            if data is not None:
+                return fetched_ms / 1000.0, data
+        return None
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Newest snapshot if it is younger than max_age (defaults to the cache TTL)"""
+        max_age = self.ttl_seconds if max_age is None else max_age
+        if max_age <= 0:
+            return None
+        times = self._snapshot_times(symbol)
+        if not times or time.time() - times[0] / 1000.0 > max_age:
+            return None
+        snapshot = self.latest(symbol)
+        return snapshot[1] if snapshot else None
+
+    def put(self, symbol: str, option_chain: Dict, fetched_at: Optional[float] = None):
+        """Store a new snapshot and prune old ones"""
+        fetched_ms = int((fetched_at or time.time()) * 1000)
+        directory = self._symbol_dir(symbol, create=True)
+        try:
+            write_json_atomic(os.path.join(directory, f"{fetched_ms}.json"), option_chain)
+            with self._lock:
+                for old_ms in self._snapshot_times(symbol)[self.max_snapshots:]:
+                    try:
+                        os.remove(os.path.join(directory, f"{old_ms}.json"))
+                    except OSError:
+                        pass
+        except Exception as e:
+            print(f"⚠️  Could not cache option chain for {symbol}: {str(e)}")
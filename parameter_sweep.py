@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Parallel Parameter Sweep Backtester
+Tunes the strategy generators' hard-coded constants (short-strike offsets,
+wing widths, the 5-day exit horizon, lot counts) from stored history instead
+of guesswork.
+- Candidates are priced once in the parent (live chain premiums when chains
+  are fetched, otherwise the analyzer's fallback premiums)
+- (holding period, symbol chunk) tasks are scored in a process pool with the
+  vectorized batch backtester; P&L is the legs' intrinsic value at exit
+- Results are aggregated per parameter combination and written as a CSV
+  ranked by average P&L per unit of capital at risk (independent of the lot
+  count), then average score
+
+Grid semantics (strikes relative to the ATM strike; the generators' own layout,
+strategy_rules.STRATEGY_LEGS, is always included and flagged as the baseline):
+  strike_offset  distance of the sold leg(s) from ATM, out of the money
+                 (Long Call / Long Put: of the bought leg)
+  wing_width     distance from each sold leg to its protective bought leg
+  Bull Call Spread   sell CE ATM + offset, buy CE one wing lower  (baseline 100 / 100)
+  Bear Put Spread    sell PE ATM - offset, buy PE one wing higher (baseline 50 / 100)
+  Iron Condor        sell ATM ± offset, buy one wing further out  (baseline 50 / 100)
+  Long Call / Put    buy ATM ± offset                             (baseline 0)
+  Long Straddle      ATM (offsets / wings do not apply)
+
+Usage:
+  python parameter_sweep.py --days 365 --horizons 3 5 7 10 --output sweep.csv
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_backtester import BatchBacktester, CandidateTable
+from lot_sizes import get_lot_size
+from strategy_rules import STRATEGY_LEGS, atm_strike_for, position_net_cost
+
+STRATEGY_TYPES = ('Bull Call Spread', 'Long Call', 'Long Put', 'Bear Put Spread', 'Long Straddle', 'Iron Condor')
+SPREAD_TYPES = ('Bull Call Spread', 'Bear Put Spread', 'Iron Condor')
+DEFAULT_OFFSETS = (0, 50, 100, 150, 200)
+DEFAULT_WING_WIDTHS = (50, 100, 150, 200)
+DEFAULT_HORIZONS = (3, 5, 7, 10)
+DEFAULT_LOTS = (1, 2, 3, 4, 5)
+MAX_INVESTMENT = 50000  # Same cap the strategy generators size positions against
+IRON_CONDOR_MIN_RISK = 50  # generate_iron_condor's floor for max loss per share
+
+RESULT_FIELDS = ('strategy_type', 'strike_offset', 'wing_width', 'baseline', 'horizon', 'lots', 'symbols',
+                 'avg_return_on_risk', 'avg_score', 'avg_profit_accuracy', 'avg_pnl_per_trade',
+                 'avg_capital_at_risk')
+
+Leg = Tuple[str, float, int]  # (option type, strike, quantity: +1 bought / -1 sold)
+
+
+def grid_legs(strategy_type: str, atm_strike: float, offset: float, wing_width: float) -> List[Leg]:
+    """Legs of one grid point (see the module docstring)"""
+    if strategy_type == 'Long Call':
+        return [('CE', atm_strike + offset, 1)]
+    if strategy_type == 'Long Put':
+        return [('PE', atm_strike - offset, 1)]
+    if strategy_type == 'Bull Call Spread':
+        return [('CE', atm_strike + offset - wing_width, 1), ('CE', atm_strike + offset, -1)]
+    if strategy_type == 'Bear Put Spread':
+        return [('PE', atm_strike - offset + wing_width, 1), ('PE', atm_strike - offset, -1)]
+    if strategy_type == 'Iron Condor':
+        return [('CE', atm_strike + offset, -1), ('CE', atm_strike + offset + wing_width, 1),
+                ('PE', atm_strike - offset, -1), ('PE', atm_strike - offset - wing_width, 1)]
+    return [(option_type, atm_strike + strike_offset, quantity)
+            for option_type, strike_offset, quantity in STRATEGY_LEGS[strategy_type]]
+
+
+def baseline_point(strategy_type: str) -> Tuple[int, int]:
+    """(strike_offset, wing_width) of the generator's own layout (strategy_rules.STRATEGY_LEGS)"""
+    legs = STRATEGY_LEGS[strategy_type]
+    if strategy_type not in SPREAD_TYPES:
+        return abs(legs[0][1]), 0
+    sold_type, sold_offset, _ = next(leg for leg in legs if leg[2] < 0)
+    bought_offset = next(offset for option_type, offset, quantity in legs if quantity > 0 and option_type == sold_type)
+    return abs(sold_offset), abs(bought_offset - sold_offset)
+
+
+def _grid_points(strategy_type: str, offsets: Sequence[int], wing_widths: Sequence[int]) -> List[Tuple[int, int]]:
+    baseline_offset, baseline_wing = baseline_point(strategy_type)
+    offsets = sorted(set(offsets) | {baseline_offset})
+    if strategy_type == 'Long Straddle':
+        return [(0, 0)]
+    if strategy_type not in SPREAD_TYPES:
+        return [(offset, 0) for offset in offsets]
+    return [(offset, wing_width) for offset in offsets for wing_width in sorted(set(wing_widths) | {baseline_wing})
+            if wing_width > 0]
+
+
+def _backtest_arguments(strategy_type: str, atm_strike: float, legs: List[Leg], offset: float,
+                        wing_width: float) -> Tuple[float, float]:
+    """
+    (buy_strike, sell_strike) in practical_strategy_backtest's convention
+    Iron Condor: the live analyzer scores ATM with zone IRON_CONDOR_WING_WIDTH (100), the
+    midpoint of the generator's wings (shorts 50, longs 150 out); every grid point keeps
+    that rule, so the baseline reproduces strategy_rules.backtest_arguments and the live score
+    """
+    if strategy_type == 'Iron Condor':
+        return atm_strike, offset + wing_width / 2
+    bought = next(strike for _, strike, quantity in legs if quantity > 0)
+    sold = next((strike for _, strike, quantity in legs if quantity < 0), 0)
+    return bought, sold
+
+
+def _max_loss(strategy_type: str, net_cost: float, wing_width: float) -> float:
+    """Capital at risk per share"""
+    if strategy_type == 'Iron Condor':
+        max_loss = wing_width + net_cost  # net_cost is the negative credit
+        return max_loss if max_loss > 0 else IRON_CONDOR_MIN_RISK
+    return net_cost
+
+
+def grid_candidates(symbol: str, spot_price: float, premium: Callable[[float, str], float],
+                    strategy_types: Sequence[str] = STRATEGY_TYPES, offsets: Sequence[int] = DEFAULT_OFFSETS,
+                    wing_widths: Sequence[int] = DEFAULT_WING_WIDTHS) -> List[Dict]:
+    """
+    Candidate records for one symbol over the strike grid
+    premium(strike, 'CE' / 'PE') -> option premium
+    Records carry practical_strategy_backtest's arguments plus the grid point, the legs
+    and max_loss (per share, the capital at risk). Debit positions that would not cost
+    anything at these premiums are skipped.
+    """
+    atm_strike = atm_strike_for(spot_price)
+    candidates = []
+    for strategy_type in strategy_types:
+        baseline = baseline_point(strategy_type)
+        for offset, wing_width in _grid_points(strategy_type, offsets, wing_widths):
+            legs = grid_legs(strategy_type, atm_strike, offset, wing_width)
+            net_cost = position_net_cost(strategy_type, [(option_type, strike, quantity, premium(strike, option_type))
+                                                         for option_type, strike, quantity in legs])
+            max_loss = _max_loss(strategy_type, net_cost, wing_width)
+            if max_loss <= 0:
+                continue
+            buy_strike, sell_strike = _backtest_arguments(strategy_type, atm_strike, legs, offset, wing_width)
+            candidates.append({
+                'symbol': symbol, 'strategy_type': strategy_type, 'buy_strike': buy_strike,
+                'sell_strike': sell_strike, 'net_cost': net_cost, 'max_loss': max_loss, 'legs': legs,
+                'strike_offset': offset, 'wing_width': wing_width, 'baseline': (offset, wing_width) == baseline
+            })
+    return candidates
+
+
+def _mean_pnl(backtester: BatchBacktester, candidates: List[Dict]) -> np.ndarray:
+    """Average per-share P&L at exit (legs' intrinsic value minus net cost) per candidate"""
+    pnl = np.full(len(candidates), np.nan)
+    by_leg_count = {}
+    for i, candidate in enumerate(candidates):
+        if candidate['symbol'] in backtester.row_of:
+            by_leg_count.setdefault(len(candidate['legs']), []).append(i)
+
+    for members in by_leg_count.values():
+        members = np.asarray(members)
+        rows = np.array([backtester.row_of[candidates[i]['symbol']] for i in members])
+        legs = [candidates[i]['legs'] for i in members]
+        is_call = np.array([[option_type == 'CE' for option_type, _, _ in leg] for leg in legs])[:, :, None]
+        strikes = np.array([[strike for _, strike, _ in leg] for leg in legs], dtype=np.float64)[:, :, None]
+        quantities = np.array([[quantity for _, _, quantity in leg] for leg in legs], dtype=np.float64)[:, :, None]
+        net_costs = np.array([candidates[i]['net_cost'] for i in members])[:, None]
+
+        exit_ = backtester.exit[rows][:, None, :]  # candidates x 1 x scenarios
+        with np.errstate(invalid='ignore'):
+            intrinsic = np.where(is_call, np.maximum(exit_ - strikes, 0), np.maximum(strikes - exit_, 0))
+            per_scenario = (quantities * intrinsic).sum(axis=1) - net_costs
+        valid = backtester.valid[rows]
+        totals = valid.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pnl[members] = np.where(totals > 0, np.where(valid, per_scenario, 0.0).sum(axis=1) / np.maximum(totals, 1),
+                                    np.nan)
+    return pnl
+
+
+def _score_task(task: Tuple[int, Dict[str, List[float]], List[Dict]]) -> List[Dict]:
+    """Process-pool worker: score one symbol chunk's candidates for one holding period"""
+    horizon, closes, candidates = task
+    backtester = BatchBacktester(closes, horizon=horizon)
+    table = CandidateTable.from_records(candidates)
+    scores = backtester.score(table)
+    pnl = _mean_pnl(backtester, candidates)
+
+    rows = []
+    for i, candidate in enumerate(candidates):
+        if scores['known'][i] and scores['scenarios_tested'][i] > 0:
+            rows.append(dict(candidate, horizon=horizon, score=float(scores['score'][i]),
+                             profit_accuracy=float(scores['profit_accuracy'][i]), pnl=float(pnl[i])))
+    return rows
+
+
+def _chunks(symbols: List[str], size: int) -> List[List[str]]:
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+def run_sweep(closes_by_symbol: Dict[str, List[float]], candidates: List[Dict],
+              horizons: Sequence[int] = DEFAULT_HORIZONS, lots: Sequence[int] = DEFAULT_LOTS,
+              max_investment: float = MAX_INVESTMENT, max_workers: Optional[int] = None,
+              symbols_per_task: int = 25) -> List[Dict]:
+    """
+    Score every candidate for every holding period across a process pool, expand
+    the lot counts and aggregate per parameter combination
+    Returns result rows (RESULT_FIELDS) ranked best first (return on capital at risk)
+    """
+    by_symbol = {}
+    for candidate in candidates:
+        by_symbol.setdefault(candidate['symbol'], []).append(candidate)
+
+    tasks = []
+    for horizon in horizons:
+        for chunk in _chunks([s for s in by_symbol if s in closes_by_symbol], symbols_per_task):
+            tasks.append((horizon, {s: closes_by_symbol[s] for s in chunk},
+                          [c for s in chunk for c in by_symbol[s]]))
+
+    scored = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rows in executor.map(_score_task, tasks):
+            scored.extend(rows)
+
+    # (strategy, offset, wing, baseline, horizon, lots) -> per-symbol values
+    groups = {}
+    for row in scored:
+        lot_size = get_lot_size(row['symbol'])
+        for lot_count in lots:
+            capital = row['max_loss'] * lot_size * lot_count
+            if capital > max_investment:
+                continue
+            key = (row['strategy_type'], row['strike_offset'], row['wing_width'], row['baseline'], row['horizon'],
+                   lot_count)
+            group = groups.setdefault(key, {'score': [], 'profit_accuracy': [], 'pnl': [], 'capital': [],
+                                            'return_on_risk': []})
+            group['score'].append(row['score'])
+            group['profit_accuracy'].append(row['profit_accuracy'])
+            group['pnl'].append(row['pnl'] * lot_size * lot_count)
+            group['capital'].append(capital)
+            group['return_on_risk'].append(row['pnl'] / row['max_loss'])
+
+    results = []
+    for (strategy_type, offset, wing_width, baseline, horizon, lot_count), group in groups.items():
+        results.append({
+            'strategy_type': strategy_type,
+            'strike_offset': offset,
+            'wing_width': wing_width,
+            'baseline': baseline,
+            'horizon': horizon,
+            'lots': lot_count,
+            'symbols': len(group['score']),
+            'avg_return_on_risk': round(float(np.mean(group['return_on_risk'])), 4),
+            'avg_score': round(float(np.mean(group['score'])), 2),
+            'avg_profit_accuracy': round(float(np.mean(group['profit_accuracy'])), 2),
+            'avg_pnl_per_trade': round(float(np.mean(group['pnl'])), 2),
+            'avg_capital_at_risk': round(float(np.mean(group['capital'])), 2),
+        })
+    # P&L and capital both scale with the lot count, so their ratio ranks positions fairly;
+    # among equal returns the smaller position comes first
+    results.sort(key=lambda r: (-r['avg_return_on_risk'], -r['avg_score'], r['lots']))
+    return results
+
+
+def save_results(results: List[Dict], path: str):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    from fno_symbols import get_all_fno_symbols
+    from market_analyzer_v5_integrated import IntegratedMarketAnalyzer
+
+    parser = argparse.ArgumentParser(description='Grid-search strategy constants over stored history')
+    parser.add_argument('--symbols', nargs='*', help='default: every F&O symbol with stored history')
+    parser.add_argument('--days', type=int, default=365, help='calendar days of stored history to replay')
+    parser.add_argument('--strategies', nargs='*', default=list(STRATEGY_TYPES), choices=STRATEGY_TYPES)
+    parser.add_argument('--offsets', nargs='*', type=int, default=list(DEFAULT_OFFSETS))
+    parser.add_argument('--wing-widths', nargs='*', type=int, default=list(DEFAULT_WING_WIDTHS))
+    parser.add_argument('--horizons', nargs='*', type=int, default=list(DEFAULT_HORIZONS))
+    parser.add_argument('--lots', nargs='*', type=int, default=list(DEFAULT_LOTS))
+    parser.add_argument('--max-investment', type=float, default=MAX_INVESTMENT)
+    parser.add_argument('--chains', action='store_true', help='price legs from live NSE option chains')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default='parameter_sweep.csv')
+    args = parser.parse_args()
+
+    analyzer = IntegratedMarketAnalyzer(background_news=False)
+    stored = set(analyzer.history.symbols())
+    symbols = [s.upper() for s in args.symbols] if args.symbols else [s for s in get_all_fno_symbols() if s in stored]
+
+    closes = {}
+    for symbol in symbols:
+        history = analyzer.history.load(symbol, days=args.days)
+        if len(history['closes']) > max(args.horizons):
+            closes[symbol] = history['closes']
+    chains = analyzer.nse.fetch_option_chains(list(closes)) if args.chains else {}
+
+    candidates = []
+    for symbol, symbol_closes in closes.items():
+        spot_price = symbol_closes[-1]
+        chain = chains.get(symbol)
+        candidates.extend(grid_candidates(
+            symbol, spot_price,
+            lambda strike, option_type: analyzer.get_option_premium(chain, strike, option_type, spot_price),
+            args.strategies, args.offsets, args.wing_widths))
+
+    print(f"🔬 Sweeping {len(candidates)} candidates × {len(args.horizons)} horizons × {len(args.lots)} lot counts "
+          f"over {len(closes)} symbols ({args.workers} processes)")
+    results = run_sweep(closes, candidates, args.horizons, args.lots, args.max_investment, args.workers)
+    save_results(results, args.output)
+    print(f"✅ {len(results)} parameter combinations ranked → {args.output}")
+    for row in results[:5]:
+        print(f"   {row['strategy_type']:<16} offset {row['strike_offset']:>4} wing {row['wing_width']:>4} "
+              f"{row['horizon']:>2}d × {row['lots']} lots: {row['avg_return_on_risk'] * 100:+.1f}% of capital at risk, "
+              f"score {row['avg_score']:.1f}, P&L ₹{row['avg_pnl_per_trade']:,.0f}"
+              f"{' (baseline)' if row['baseline'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
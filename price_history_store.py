@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Local OHLCV History Store
+Daily bars per symbol in one SQLite file, so each run only downloads the bars
+since the last stored trading day and everything older is read from disk.
+- One row per (symbol, trading date); re-fetched days replace the stored row
+  (today's still-forming bar is simply overwritten on the next run)
+- History keeps growing across runs - deeper lookbacks need no extra downloads
+Location: <cache root>/price_history/bars.sqlite3
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
+
+from local_store import cache_dir
+
+# Columns of a bars dict, in table order
+BAR_FIELDS = ('opens', 'highs', 'lows', 'closes', 'volumes')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol    TEXT    NOT NULL,
+    date      TEXT    NOT NULL,
+    ts        INTEGER NOT NULL,
+    open      REAL,
+    high      REAL,
+    low       REAL,
+    close     REAL    NOT NULL,
+    volume    INTEGER,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID
+"""
+
+
+def empty_bars() -> Dict[str, List]:
+    """Bars dict with no rows"""
+    bars = {'timestamps': [], 'dates': []}
+    for field in BAR_FIELDS:
+        bars[field] = []
+    return bars
+
+
+class PriceHistoryStore:
+    """SQLite-backed daily bar history, safe to share between worker threads"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(cache_dir('price_history'), 'bars.sqlite3')
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        """Epoch seconds of the newest stored bar, None if the symbol has no history"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE symbol = ?", (symbol.upper(),)
+            ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def append(self, symbol: str, bars: Dict[str, List], gmtoffset: int = 0) -> int:
+        """
+        Insert / replace bars (dict of parallel lists: timestamps + BAR_FIELDS)
+        gmtoffset: exchange offset from UTC in seconds, used to derive the trading date
+        Returns: number of rows written
+        """
+        tz = timezone(timedelta(seconds=gmtoffset or 0))
+        rows = []
+        for i, ts in enumerate(bars.get('timestamps', [])):
+            close = bars['closes'][i]
+            if ts is None or close is None:
+                continue
+            date = datetime.fromtimestamp(ts, tz).strftime('%Y-%m-%d')
+            rows.append((symbol.upper(), date, int(ts)) + tuple(bars[field][i] for field in BAR_FIELDS))
+
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bars (symbol, date, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def load(self, symbol: str, days: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, List]:
+        """
+        Stored bars, oldest first
+        days: only bars from the last `days` calendar days
+        limit: only the newest `limit` bars
+        """
+        query = "SELECT ts, date, open, high, low, close, volume FROM bars WHERE symbol = ?"
+        params = [symbol.upper()]
+        if days is not None:
+            query += " AND ts >= ?"
+            params.append(int(time.time()) - days * 24 * 60 * 60)
+        query += " ORDER BY ts DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        bars = empty_bars()
+        for ts, date, open_, high, low, close, volume in reversed(rows):
+            bars['timestamps'].append(ts)
+            bars['dates'].append(date)
+            bars['opens'].append(open_)
+            bars['highs'].append(high)
+            bars['lows'].append(low)
+            bars['closes'].append(close)
+            bars['volumes'].append(volume)
+        return bars
+
+    def symbols(self) -> List[str]:
+        """Symbols that have stored history"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT symbol FROM bars ORDER BY symbol").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
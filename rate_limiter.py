@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Token Bucket Rate Limiter
+Shared request pacing for NSE / Yahoo / news endpoints
+Works from worker threads (acquire) and from asyncio code (acquire_async)
+"""
+
+import asyncio
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """
+    Global token bucket - one bucket paces every caller that shares it
+
+    rate:     tokens added per second (= sustained requests/second)
+    capacity: burst size (how many requests may go out back-to-back)
+    """
+
+    def __init__(self, rate: float = 2.0, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = Lock()
+
+    def _reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now (possibly going negative) and return how long the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block the calling thread until a request slot is available"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        """Wait (without blocking the event loop) until a request slot is available"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
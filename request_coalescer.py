@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Request Coalescer
+Single-flight de-duplication of identical requests plus a short-lived memo
+- Concurrent callers for the same key share one in-flight call
+- Back-to-back callers within memo_ttl seconds get the previous result
+- Callers can also accept the result of other keys (e.g. a full download
+  standing in for a partial one)
+"""
+
+import time
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class _InFlightCall:
+    """Result slot shared by the leader and the waiters of one call"""
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+
+
+class RequestCoalescer:
+    """Single-flight per key with a short result memo"""
+
+    def __init__(self, memo_ttl: float = 5.0, max_memo_entries: int = 512):
+        self.memo_ttl = memo_ttl
+        self.max_memo_entries = max_memo_entries
+        self._lock = Lock()
+        self._in_flight: Dict[Hashable, _InFlightCall] = {}
+        self._memo: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def recent(self, key: Hashable) -> Optional[Any]:
+        """Memoized result for key if it has not expired yet"""
+        with self._lock:
+            return self._recent_locked(key)
+
+    def _recent_locked(self, key: Hashable) -> Optional[Any]:
+        entry = self._memo.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def do(self, key: Hashable, fn: Callable[[], Any], share: Iterable[Hashable] = ()) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        share: other keys whose memoized or in-flight result also satisfies this call;
+        they are checked together with key, so the caller never starts a second download
+        while one of them is running. A shared call that fails falls back to fn.
+        None results and exceptions are shared with the waiting callers but never memoized,
+        so the next caller retries.
+        """
+        keys = (key,) + tuple(share)
+        with self._lock:
+            for candidate in keys:
+                recent = self._recent_locked(candidate)
+                if recent is not None:
+                    return recent
+
+            joined = next((candidate for candidate in keys if candidate in self._in_flight), None)
+            leader = joined is None
+            if leader:
+                call = _InFlightCall()
+                self._in_flight[key] = call
+            else:
+                call = self._in_flight[joined]
+
+        if not leader:
+            call.done.wait()
+            if joined != key and (call.error is not None or call.result is None):
+                return self.do(key, fn)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                if call.error is None and call.result is not None and self.memo_ttl > 0:
+                    self._remember_locked(key, call.result)
+            call.done.set()
+
+        return call.result
+
+    def _remember_locked(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        if len(self._memo) >= self.max_memo_entries:
+            self._memo = {k: v for k, v in self._memo.items() if v[0] > now}
+        self._memo[key] = (now + self.memo_ttl, value)
+
+    def forget(self, key: Hashable):
+        """Drop a memoized result"""
+        with self._lock:
+            self._memo.pop(key, None)
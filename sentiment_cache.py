@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+News Sentiment Cache
+News moves far slower than the re-scan cadence, so scraped sentiment is reused
+- SentimentCache: combined sentiment per symbol on disk with a TTL
+- HeadlineMemo: keyword counts memoized per normalized headline, persisted across
+  runs, so a headline seen once is never scored again (whatever it is listed with)
+Layout: <cache root>/sentiment/<SYMBOL>.json, <cache root>/sentiment/headline_memo.json
+"""
+
+import hashlib
+import os
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from local_store import cache_dir, read_json, write_json_atomic
+
+
+class SentimentCache:
+    """On-disk combined sentiment per symbol with a TTL"""
+
+    def __init__(self, ttl_seconds: float = 1800, directory: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory or cache_dir('sentiment')
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.directory, f"{symbol.upper()}.json")
+
+    def entry(self, symbol: str) -> Optional[Tuple[float, Dict]]:
+        """(fetched_at epoch, sentiment) of any age, or None"""
+        stored = read_json(self._path(symbol))
+        if not stored or 'sentiment' not in stored:
+            return None
+        return stored.get('fetched_at', 0), stored['sentiment']
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Sentiment younger than max_age (default: the TTL), else None"""
+        entry = self.entry(symbol)
+        if entry is None:
+            return None
+        fetched_at, sentiment = entry
+        max_age = self.ttl_seconds if max_age is None else max_age
+        return sentiment if time.time() - fetched_at <= max_age else None
+
+    def put(self, symbol: str, sentiment: Dict, fetched_at: Optional[float] = None):
+        write_json_atomic(self._path(symbol), {
+            'symbol': symbol.upper(),
+            'fetched_at': fetched_at or time.time(),
+            'sentiment': sentiment
+        })
+
+
+class HeadlineMemo:
+    """Persistent headline-hash -> (positive, negative) keyword counts memo"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 20000, autosave_every: int = 25):
+        self.path = path or os.path.join(cache_dir('sentiment'), 'headline_memo.json')
+        self.max_entries = max_entries
+        self.autosave_every = autosave_every
+        self._lock = Lock()
+        # Drop entries in older layouts (whole-list sentiment dicts)
+        self._entries = {key: value for key, value in (read_json(self.path) or {}).items()
+                         if isinstance(value, list)}
+        self._unsaved = 0
+
+    @staticmethod
+    def key(headline: str, version: str = '') -> str:
+        """Hash of the scorer version + headline (case and whitespace normalized)"""
+        normalized = ' '.join(headline.lower().split())
+        return hashlib.sha1(f"{version}\n{normalized}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            value = self._entries.get(key)
+        return tuple(value) if value is not None else None
+
+    def put(self, key: str, counts: Tuple[int, int]):
+        with self._lock:
+            self._entries[key] = list(counts)
+            if len(self._entries) > self.max_entries:
+                # Dicts keep insertion order - drop the oldest entries first
+                for old_key in list(self._entries)[:len(self._entries) - self.max_entries]:
+                    del self._entries[old_key]
+            self._unsaved += 1
+            save_now = self._unsaved >= self.autosave_every
+        if save_now:
+            self.flush()
+
+    def flush(self):
+        """Write unsaved entries to disk"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            snapshot = dict(self._entries)
+            self._unsaved = 0
+        try:
+            write_json_atomic(self.path, snapshot)
+        except OSError as e:
+            print(f"⚠️  Could not save headline memo: {str(e)}")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Keyword Sentiment Matcher
+All lexicon terms compiled into one word-boundary regex, so a text is scanned
+once regardless of lexicon size. Terms match whole words plus simple inflections
+('surges', 'gained', 'falling'), so 'up' no longer counts inside 'upgrade'.
+- count() / count_batch(): (positive, negative) counts of one / many texts,
+  the latter in a single regex pass
+- combine(): sentiment of a headline list from its per-headline counts
+- score(): sentiment of one headline list
+- score_batch(): sentiment of many headline lists in a single regex pass
+Bump LEXICON_VERSION whenever the word lists or scoring rules change - it is
+part of the headline memo key, so stale memoized counts are never reused.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Tuple
+
+LEXICON_VERSION = 'v2-wordboundary'
+
+POSITIVE_WORDS = [
+    'surge', 'jump', 'rally', 'gain', 'profit', 'growth', 'up', 'rise',
+    'high', 'beat', 'strong', 'positive', 'bullish', 'upgrade', 'buy',
+    'outperform', 'record', 'boost', 'success', 'winner', 'top'
+]
+
+NEGATIVE_WORDS = [
+    'fall', 'drop', 'crash', 'loss', 'down', 'decline', 'weak', 'negative',
+    'bearish', 'downgrade', 'sell', 'underperform', 'miss', 'concern',
+    'worry', 'risk', 'threat', 'bottom', 'worst', 'fail'
+]
+
+
+class SentimentMatcher:
+    """Single-pass positive / negative keyword counter"""
+
+    def __init__(self, positive: Iterable[str] = POSITIVE_WORDS, negative: Iterable[str] = NEGATIVE_WORDS):
+        self.polarity = {}
+        for word in positive:
+            self.polarity[word.lower()] = 1
+        for word in negative:
+            self.polarity[word.lower()] = -1
+        # Longest first so overlapping alternatives resolve to the longer term
+        terms = sorted(self.polarity, key=len, reverse=True)
+        self.pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')(?:s|es|ed|d|ing)?\b')
+
+    def count(self, text: str) -> Tuple[int, int]:
+        """(positive, negative) keyword counts in one scan"""
+        positive = negative = 0
+        for match in self.pattern.finditer(text.lower()):
+            if self.polarity[match.group(1)] > 0:
+                positive += 1
+            else:
+                negative += 1
+        return positive, negative
+
+    @staticmethod
+    def _result(positive_count: int, negative_count: int, news_count: int) -> Dict:
+        total = positive_count + negative_count
+
+        if total == 0:
+            score = 0
+            momentum = 'NEUTRAL'
+        else:
+            score = (positive_count - negative_count) / total
+            if score > 0.3:
+                momentum = 'POSITIVE'
+            elif score < -0.3:
+                momentum = 'NEGATIVE'
+            else:
+                momentum = 'NEUTRAL'
+
+        return {
+            'score': round(score, 2),
+            'momentum': momentum,
+            'positive_count': positive_count,
+            'negative_count': negative_count,
+            'news_count': news_count
+        }
+
+    def combine(self, counts: List[Tuple[int, int]]) -> Dict:
+        """Sentiment of a headline list from its per-headline (positive, negative) counts"""
+        return self._result(sum(c[0] for c in counts), sum(c[1] for c in counts), len(counts))
+
+    def score(self, headlines: List[str]) -> Dict:
+        """Sentiment of one headline list"""
+        positive, negative = self.count(' '.join(headlines))
+        return self._result(positive, negative, len(headlines))
+
+    def count_batch(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """(positive, negative) counts of many texts in one regex pass"""
+        texts = [text.lower() for text in texts]
+
+        # One text, newline-separated (a word boundary); match offsets map back to their text
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        corpus = '\n'.join(texts)
+
+        positive = [0] * len(texts)
+        negative = [0] * len(texts)
+        for match in self.pattern.finditer(corpus):
+            i = bisect.bisect_right(starts, match.start()) - 1
+            if self.polarity[match.group(1)] > 0:
+                positive[i] += 1
+            else:
+                negative[i] += 1
+        return list(zip(positive, negative))
+
+    def score_batch(self, headlines_by_key: Dict[str, List[str]]) -> Dict[str, Dict]:
+        """
+        Sentiment of many headline lists (e.g. the whole symbol universe) in one regex pass
+        Returns: {key: sentiment} with the same shape as score()
+        """
+        keys = list(headlines_by_key)
+        counts = self.count_batch([' '.join(headlines_by_key[key]) for key in keys])
+        return {key: self._result(positive, negative, len(headlines_by_key[key]))
+                for key, (positive, negative) in zip(keys, counts)}
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in Server for NSE, Yahoo and news endpoints
+Serves recorded cassettes (see http_transport.py) over plain HTTP with
+configurable latency and error injection, for reproducible offline load tests.
+
+Usage:
+  python stand_in_server.py --port 8765 --latency 0.15 --jitter 0.05 --error-rate 0.02
+  MARKET_ANALYZER_HTTP_MODE=standin python market_analyzer_v5_integrated.py
+
+Requests arrive as /<host>/<path>?<query> (rewritten by http_transport.StandInAdapter).
+"""
+
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from http_transport import load_cassette
+
+
+class StandInServer:
+    """Threaded HTTP server replaying cassettes with injected latency and errors"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, cassette_dir: Optional[str] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.cassette_dir = cassette_dir
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self, 'GET')
+
+            def do_POST(self):
+                server._handle(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass  # Silent - stats are kept instead
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        self._count('requests')
+
+        delay = self.latency + (random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.error_rate and random.random() < self.error_rate:
+            self._count('errors')
+            self._reply(handler, self.error_status, {}, b'')
+            return
+
+        # /<host>/<path>?<query> -> https://<host>/<path>?<query>
+        original_url = f"https://{handler.path.lstrip('/')}"
+        cassette = load_cassette(method, original_url, self.cassette_dir)
+        if cassette is None:
+            self._count('misses')
+            self._reply(handler, 404, {}, b'')
+            return
+
+        self._count('hits')
+        self._reply(handler, cassette['status'], cassette.get('headers', {}), cassette['body'])
+
+    def _reply(self, handler: BaseHTTPRequestHandler, status: int, headers: dict, body: bytes):
+        handler.send_response(status)
+        for name, value in headers.items():
+            if name.lower() not in ('connection', 'content-length', 'set-cookie'):
+                handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> 'StandInServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stand-in server for NSE / Yahoo / news cassettes')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='± random seconds added to latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--cassette-dir', default=None)
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, args.latency, args.jitter,
+                           args.error_rate, args.error_status, args.cassette_dir)
+    print(f"🧪 Stand-in server on {server.url} (latency {args.latency}s ±{args.jitter}s, errors {args.error_rate:.0%})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.stats}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
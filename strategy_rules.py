@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Strategy Selection Rules
+The analyzer's strategy choice as pure functions of market conditions, so the
+live scan (generate_strategy) and historical replays (walk_forward.py) apply
+exactly the same rules.
+- select_strategy: conditions -> strategy type (or 'Watch')
+- STRATEGY_LEGS / strategy_legs: the option legs each generator trades
+- backtest_arguments: practical_strategy_backtest's (buy, sell, net cost) for a position
+- position_net_cost: a position's net cost from its leg premiums, with the generators' floors
+- fallback_premium: the approximate premium used when a strike has no chain data
+"""
+
+from typing import List, Sequence, Tuple
+
+WATCH = 'Watch'
+
+# strategy type -> legs (option type, strike offset from ATM, quantity: +1 bought / -1 sold)
+STRATEGY_LEGS = {
+    'Bull Call Spread': (('CE', 0, 1), ('CE', 100, -1)),
+    'Long Call': (('CE', 0, 1),),
+    'Bear Put Spread': (('PE', 50, 1), ('PE', -50, -1)),
+    'Long Put': (('PE', 0, 1),),
+    'Long Straddle': (('CE', 0, 1), ('PE', 0, 1)),
+    'Iron Condor': (('CE', 50, -1), ('CE', 150, 1), ('PE', -50, -1), ('PE', -150, 1)),
+}
+
+IRON_CONDOR_WING_WIDTH = 100
+IRON_CONDOR_MIN_PREMIUMS = (15, 5)  # (sold, bought) floors when any leg has no valid premium
+IRON_CONDOR_MIN_CREDIT = 10
+
+# Generators that drop the trade when practical_strategy_backtest says AVOID
+BACKTEST_GATED = frozenset({'Long Call', 'Long Put', 'Bear Put Spread', 'Long Straddle'})
+
+
+def atm_strike_for(price: float) -> float:
+    """Nearest 50-point strike"""
+    return round(price / 50) * 50
+
+
+def select_strategy(trend: str, price_change: float, rsi: float, confidence: int,
+                    volume_volatility: str = 'LOW') -> str:
+    """
+    Strategy type for the given conditions (generate_strategy's rules, in order)
+    volume_volatility: 'HIGH' / 'MEDIUM' / 'LOW' option volume activity around ATM
+    """
+    # Strong bullish signals
+    if (trend == 'UPTREND' and price_change > 0.5) or (price_change > 2):
+        return 'Long Call' if confidence >= 70 else 'Bull Call Spread'
+
+    # Strong bearish signals
+    if (trend == 'DOWNTREND' and price_change < -0.5) or (price_change < -2):
+        return 'Long Put' if confidence >= 70 else 'Bear Put Spread'
+
+    # High volatility based on VOLUME, not price change
+    if volume_volatility == 'HIGH':
+        return 'Long Straddle'
+
+    # RSI-based strategies
+    if rsi > 65:  # Overbought
+        return 'Bear Put Spread'
+    if rsi < 35:  # Oversold
+        return 'Bull Call Spread'
+
+    # Neutral market with moderate confidence
+    if confidence >= 60 and trend == 'SIDEWAYS' and abs(price_change) < 1.5:
+        return 'Iron Condor'
+
+    # Default strategy for moderate conditions
+    if confidence >= 50:
+        return 'Bull Call Spread' if price_change >= 0 else 'Bear Put Spread'
+    return WATCH
+
+
+def strategy_legs(strategy_type: str, atm_strike: float) -> List[Tuple[str, float, int]]:
+    """(option type, strike, quantity) legs of a strategy around the ATM strike"""
+    return [(option_type, atm_strike + offset, quantity)
+            for option_type, offset, quantity in STRATEGY_LEGS[strategy_type]]
+
+
+def backtest_arguments(strategy_type: str, atm_strike: float, net_cost: float) -> Tuple[float, float, float]:
+    """(buy_strike, sell_strike, net_cost) as each generator passes them to practical_strategy_backtest"""
+    if strategy_type == 'Bull Call Spread':
+        return atm_strike, atm_strike + 100, net_cost
+    if strategy_type == 'Bear Put Spread':
+        return atm_strike + 50, atm_strike - 50, net_cost
+    if strategy_type == 'Iron Condor':
+        return atm_strike, IRON_CONDOR_WING_WIDTH, net_cost
+    return atm_strike, 0, net_cost
+
+
+def position_net_cost(strategy_type: str, legs: Sequence[Tuple[str, float, int, float]]) -> float:
+    """
+    Net cost per share (negative: net credit) of (option type, strike, quantity, premium) legs
+    Iron Condor: generate_iron_condor's premium floors and minimum credit
+    """
+    if strategy_type == 'Iron Condor':
+        premiums = [premium for _, _, _, premium in legs]
+        if any(premium <= 0 for premium in premiums):
+            sold_floor, bought_floor = IRON_CONDOR_MIN_PREMIUMS
+            premiums = [max(sold_floor if quantity < 0 else bought_floor, premium)
+                        for (_, _, quantity, _), premium in zip(legs, premiums)]
+        credit = -sum(quantity * premium for (_, _, quantity, _), premium in zip(legs, premiums))
+        return -(credit if credit > 0 else IRON_CONDOR_MIN_CREDIT)
+    return sum(quantity * premium for _, _, quantity, premium in legs)
+
+
+def fallback_premium(strike: float, option_type: str, spot_price: float) -> float:
+    """Approximate premium by moneyness (used when the option chain has no data for a strike)"""
+    moneyness = strike / spot_price
+    if option_type == 'CE':  # Call
+        if moneyness < 0.98:  # ITM
+            return max(spot_price - strike + 20, 5)
+        elif moneyness > 1.02:  # OTM
+            return max(10, 50 - (strike - spot_price))
+        return 25  # ATM
+    else:  # Put
+        if moneyness > 1.02:  # ITM
+            return max(strike - spot_price + 20, 5)
+        elif moneyness < 0.98:  # OTM
+            return max(10, 50 - (spot_price - strike))
+        return 25  # ATM
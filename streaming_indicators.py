@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Streaming Technical Indicators
+Compact per-symbol state that advances in O(1) per new bar, for continuous
+intraday loops (no recomputation over the whole window).
+- IndicatorState.from_history(closes) seeds the state from stored history
+- update(close) advances it by one bar, snapshot() reads the current values
+Snapshot keys / values match calculate_technical_indicators (rsi, sma_10,
+sma_20, trend) plus rsi_wilder, ema_12, ema_26 and volatility_20.
+Means (SMAs, the simple RSI, trend averages) are summed from their windows in
+the same order as calculate_technical_indicators, so rounded values match it
+exactly. Only the volatility window keeps running sums (RunningSumWindow); they
+are re-synchronized from the window every RESYNC_EVERY updates so floating-point
+drift never accumulates.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+RESYNC_EVERY = 1000
+
+
+class RollingWindow:
+    """Fixed-size window (means are summed from the window on read)"""
+
+    __slots__ = ('size', 'values')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+
+    def push(self, value: float) -> Optional[float]:
+        """Add a value; returns the value that fell out of the window (or None)"""
+        evicted = self.values[0] if len(self.values) == self.size else None
+        self.values.append(value)
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> Optional[float]:
+        """Summed from the window (a running total can differ in the last bits)"""
+        return sum(self.values) / len(self.values) if self.values else None
+
+
+class RunningSumWindow(RollingWindow):
+    """Rolling window that also keeps a running sum / sum of squares (O(1) std)"""
+
+    __slots__ = ('total', 'total_sq', '_updates')
+
+    def __init__(self, size: int):
+        super().__init__(size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def push(self, value: float) -> Optional[float]:
+        evicted = super().push(value)
+        self.total += value - (evicted or 0.0)
+        self.total_sq += value * value - (evicted * evicted if evicted is not None else 0.0)
+        self._updates += 1
+        if self._updates >= RESYNC_EVERY:
+            self.total = sum(self.values)
+            self.total_sq = sum(v * v for v in self.values)
+            self._updates = 0
+        return evicted
+
+    def std(self) -> Optional[float]:
+        """Population standard deviation"""
+        if not self.values:
+            return None
+        mean = self.total / len(self.values)
+        return max(0.0, self.total_sq / len(self.values) - mean * mean) ** 0.5
+
+
+class SMA:
+    """Simple moving average (averages what it has until the window is full)"""
+
+    __slots__ = ('window',)
+
+    def __init__(self, period: int):
+        self.window = RollingWindow(period)
+
+    def update(self, close: float) -> float:
+        self.window.push(close)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.window.mean()
+
+
+class EMA:
+    """Exponential moving average (alpha = 2 / (span + 1), seeded with the first close)"""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def update(self, close: float) -> float:
+        self.value = close if self.value is None else self.alpha * close + (1 - self.alpha) * self.value
+        return self.value
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+class SimpleRSI:
+    """The analyzer's RSI: mean gain / loss of the last `period` moves (fixed divisor)"""
+
+    __slots__ = ('period', 'previous', 'gains', 'losses')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.previous = None
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+
+    def update(self, close: float):
+        if self.previous is not None:
+            delta = close - self.previous
+            self.gains.push(delta if delta > 0 else 0.0)
+            self.losses.push(-delta if delta < 0 else 0.0)
+        self.previous = close
+
+    @property
+    def value(self) -> float:
+        return _rsi(sum(self.gains.values) / self.period, sum(self.losses.values) / self.period)
+
+
+class WilderRSI:
+    """RSI with Wilder smoothing (seeded with the mean of the first `period` moves)"""
+
+    __slots__ = ('period', 'previous', 'moves', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.previous = None
+        self.moves = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, close: float):
+        if self.previous is not None:
+            delta = close - self.previous
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.moves += 1
+            if self.moves <= self.period:
+                # Seeding: running mean of the first `period` moves
+                self.avg_gain += (gain - self.avg_gain) / self.moves
+                self.avg_loss += (loss - self.avg_loss) / self.moves
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        self.previous = close
+
+    @property
+    def ready(self) -> bool:
+        return self.moves >= self.period
+
+    @property
+    def value(self) -> float:
+        return _rsi(self.avg_gain, self.avg_loss)
+
+
+class Volatility:
+    """Rolling standard deviation of daily returns, in percent"""
+
+    __slots__ = ('previous', 'returns')
+
+    def __init__(self, period: int = 20):
+        self.previous = None
+        self.returns = RunningSumWindow(period)
+
+    def update(self, close: float):
+        if self.previous:
+            self.returns.push((close - self.previous) / self.previous * 100)
+        self.previous = close
+
+    @property
+    def value(self) -> float:
+        return self.returns.std() or 0.0
+
+
+class Trend:
+    """UPTREND / DOWNTREND / SIDEWAYS from last-5 vs previous-5 average (2% threshold)"""
+
+    __slots__ = ('recent', 'older')
+
+    def __init__(self):
+        self.recent = RollingWindow(5)
+        self.older = RollingWindow(5)
+
+    def update(self, close: float):
+        evicted = self.recent.push(close)
+        if evicted is not None:
+            self.older.push(evicted)
+
+    @property
+    def value(self) -> str:
+        if not self.older.full:
+            return 'SIDEWAYS'
+        recent_avg = self.recent.mean()
+        older_avg = self.older.mean()
+        if recent_avg > older_avg * 1.02:
+            return 'UPTREND'
+        if recent_avg < older_avg * 0.98:
+            return 'DOWNTREND'
+        return 'SIDEWAYS'
+
+
+class IndicatorState:
+    """All streaming indicators of one symbol"""
+
+    __slots__ = ('count', 'last', 'head', 'sma_10', 'sma_20', 'ema_12', 'ema_26',
+                 'rsi', 'rsi_wilder', 'volatility', 'trend')
+
+    def __init__(self):
+        self.count = 0
+        self.last = None
+        self.head = []  # First 5 closes (short-history RSI fallback)
+        self.sma_10 = SMA(10)
+        self.sma_20 = SMA(20)
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.rsi = SimpleRSI(14)
+        self.rsi_wilder = WilderRSI(14)
+        self.volatility = Volatility(20)
+        self.trend = Trend()
+
+    @classmethod
+    def from_history(cls, closes: Iterable[float]) -> 'IndicatorState':
+        state = cls()
+        for close in closes:
+            if close is not None:
+                state.update(close)
+        return state
+
+    def update(self, close: float) -> 'IndicatorState':
+        """Advance by one bar - constant time"""
+        close = float(close)
+        self.count += 1
+        self.last = close
+        if len(self.head) < 5:
+            self.head.append(close)
+        for indicator in (self.sma_10, self.sma_20, self.ema_12, self.ema_26,
+                          self.rsi, self.rsi_wilder, self.volatility, self.trend):
+            indicator.update(close)
+        return self
+
+    def _short_history_rsi(self) -> float:
+        """The analyzer's fallback below 14 closes: 5-day momentum mapped to 0-100"""
+        if self.count < 5:
+            return 50
+        recent_avg = self.trend.recent.mean()
+        older_avg = sum(self.head) / 5
+        if older_avg <= 0:
+            return 50
+        return max(0, min(100, 50 + (recent_avg - older_avg) / older_avg * 100))
+
+    def snapshot(self) -> Dict:
+        """Current values (same keys and rounding as calculate_technical_indicators, plus extras)"""
+        if self.count < 2:
+            first = self.last if self.last is not None else 0
+            return {'rsi': 50, 'sma_10': first, 'sma_20': first, 'trend': 'SIDEWAYS'}
+
+        rsi = self.rsi.value if self.count >= 14 else self._short_history_rsi()
+        rsi_wilder = self.rsi_wilder.value if self.rsi_wilder.ready else self._short_history_rsi()
+        return {
+            'rsi': round(rsi, 2),
+            'sma_10': round(self.sma_10.value, 2),
+            'sma_20': round(self.sma_20.value, 2),
+            'trend': self.trend.value,
+            'rsi_wilder': round(rsi_wilder, 2),
+            'ema_12': round(self.ema_12.value, 2),
+            'ema_26': round(self.ema_26.value, 2),
+            'volatility_20': round(self.volatility.value, 2),
+        }
@@ -0,0 +1,138 @@
+"""
+Parity of the vectorized kernels with the analyzer's original per-scenario
+loops (kept here as the reference); Black-Scholes backtest: positions are the
+generators' and P&L is measured from the net cost paid on the chain
+"""
+
+import random
+from typing import Dict, List
+
+import pytest
+
+import backtest_kernels
+from strategy_rules import STRATEGY_LEGS, atm_strike_for, backtest_arguments, strategy_legs
+
+
+def _reference_result(total_scenarios: int, accuracy_key: str, accuracy_hits: int, profitable_scenarios: int,
+                      weights, reason_label: str) -> Dict:
+    accuracy_pct = (accuracy_hits / total_scenarios * 100)
+    profit_pct = (profitable_scenarios / total_scenarios * 100)
+    overall_score = (accuracy_pct * weights[0]) + (profit_pct * weights[1])
+
+    verdict = 'STRONG_BUY' if overall_score >= 65 else 'CAUTIOUS' if overall_score >= 40 else 'AVOID'
+
+    return {
+        'score': overall_score,
+        'verdict': verdict,
+        accuracy_key: accuracy_pct,
+        'profit_accuracy': profit_pct,
+        'scenarios_tested': total_scenarios,
+        'reason': f'{profit_pct:.1f}% profitable scenarios, {accuracy_pct:.1f}% {reason_label}'
+    }
+
+
+def reference_backtest(strategy_type: str, closes: List[float], buy_strike: float, sell_strike: float,
+                       net_cost: float) -> Dict:
+    """The analyzer's original _backtest_* loops (5-day scenarios), one branch per strategy"""
+    profitable_scenarios = 0
+    accuracy_hits = 0
+    total_scenarios = len(closes) - 5
+
+    for i in range(total_scenarios):
+        entry_price = closes[i]
+        exit_price = closes[i + 5]
+        price_move_pct = (abs(exit_price - entry_price) / entry_price) * 100
+
+        if strategy_type == 'Bull Call Spread':
+            if exit_price > entry_price:
+                accuracy_hits += 1
+            breakeven_price = buy_strike + net_cost
+            if exit_price >= sell_strike:
+                profitable_scenarios += 1
+            elif exit_price >= breakeven_price:
+                profitable_scenarios += 1
+        elif strategy_type == 'Long Call':
+            if exit_price > entry_price:
+                accuracy_hits += 1
+            if exit_price >= buy_strike + net_cost:
+                profitable_scenarios += 1
+        elif strategy_type == 'Long Put':
+            if exit_price < entry_price:
+                accuracy_hits += 1
+            if exit_price <= buy_strike - net_cost:
+                profitable_scenarios += 1
+        elif strategy_type == 'Bear Put Spread':
+            if exit_price < entry_price:
+                accuracy_hits += 1
+            breakeven_price = buy_strike - net_cost
+            if exit_price <= sell_strike:
+                profitable_scenarios += 1
+            elif exit_price <= breakeven_price:
+                profitable_scenarios += 1
+        elif strategy_type == 'Long Straddle':
+            if price_move_pct > 2.0:
+                accuracy_hits += 1
+            if exit_price >= buy_strike + net_cost or exit_price <= buy_strike - net_cost:
+                profitable_scenarios += 1
+        else:  # Iron Condor: center strike, wing width, net credit
+            if price_move_pct < 1.5:
+                accuracy_hits += 1
+            if buy_strike - sell_strike + net_cost <= exit_price <= buy_strike + sell_strike - net_cost:
+                profitable_scenarios += 1
+
+    _, accuracy_key, weights, reason_label = backtest_kernels.STRATEGY_SCORING[strategy_type]
+    return _reference_result(total_scenarios, accuracy_key, accuracy_hits, profitable_scenarios,
+                             weights, reason_label)
+
+
+def random_cases(count: int = 300, seed: int = 5) -> List[tuple]:
+    """(strategy, closes, buy, sell, cost) on random walks of assorted lengths (including empty / short)"""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        strategy_type = rng.choice(list(STRATEGY_LEGS))
+        length = rng.choice([0, 1, 3, 5, 6, 7, 10, 15, 21, 30, 60])
+        price = rng.uniform(50, 5000)
+        closes = []
+        for _ in range(length):
+            price *= 1 + rng.gauss(0, 0.02)
+            closes.append(round(price, 2))
+        atm_strike = atm_strike_for(price)
+        net_cost = round(rng.uniform(-30, -5) if strategy_type == 'Iron Condor' else rng.uniform(1, 80), 2)
+        cases.append((strategy_type, closes) + backtest_arguments(strategy_type, atm_strike, net_cost))
+    return cases
+
+
+CASES = random_cases()
+
+
+@pytest.mark.parametrize('strategy_type, closes, buy_strike, sell_strike, net_cost', CASES)
+def test_kernels_match_reference_loops(strategy_type, closes, buy_strike, sell_strike, net_cost):
+    got = backtest_kernels.backtest(strategy_type, closes, buy_strike, sell_strike, net_cost)
+    if len(closes) <= 5:
+        # The loops divided by zero scenarios; the kernels report missing data
+        assert got['verdict'] == 'NO_DATA'
+        return
+    assert got == reference_backtest(strategy_type, closes, buy_strike, sell_strike, net_cost)
+
+CLOSES = []
+_rng = random.Random(11)
+_price = 1000.0
+for _ in range(90):
+    _price *= 1 + _rng.gauss(0, 0.012)
+    CLOSES.append(_price)
+
+
+@pytest.mark.parametrize('strategy_type', list(STRATEGY_LEGS))
+def test_position_legs_are_the_generator_legs(strategy_type):
+    buy_strike, sell_strike, _ = backtest_arguments(strategy_type, 1000, 0)
+    assert sorted(backtest_kernels.position_legs(strategy_type, buy_strike, sell_strike)) == \
+        sorted(strategy_legs(strategy_type, 1000))
+
+
+@pytest.mark.parametrize('strategy_type', list(STRATEGY_LEGS))
+def test_pnl_is_measured_from_net_cost(strategy_type):
+    buy_strike, sell_strike, _ = backtest_arguments(strategy_type, 1000, 0)
+    cheap = backtest_kernels.premium_backtest(strategy_type, CLOSES, buy_strike, sell_strike, 10.0, start=60)
+    dear = backtest_kernels.premium_backtest(strategy_type, CLOSES, buy_strike, sell_strike, 15.0, start=60)
+    assert cheap['avg_pnl_per_share'] - dear['avg_pnl_per_share'] == pytest.approx(5.0, abs=0.011)
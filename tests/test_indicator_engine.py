@@ -0,0 +1,126 @@
+"""
+Parity of the vectorized indicator engine with the analyzer's original
+per-symbol implementation (kept here as the reference)
+"""
+
+import random
+from typing import Dict, List
+
+import pytest
+
+from indicator_engine import RSI_PERIOD, universe_indicators
+
+
+def reference_indicators(prices: List[float]) -> Dict:
+    """The analyzer's original per-symbol implementation (plain Python)"""
+    if len(prices) < 2:
+        return {
+            'rsi': 50, 
+            'sma_10': prices[0] if prices else 0, 
+            'sma_20': prices[0] if prices else 0, 
+            'trend': 'SIDEWAYS'
+        }
+
+    # RSI calculation (need at least 14 periods)
+    if len(prices) >= 14:
+        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
+        gains = [d if d > 0 else 0 for d in deltas]
+        losses = [-d if d < 0 else 0 for d in deltas]
+
+        avg_gain = sum(gains[-14:]) / 14
+        avg_loss = sum(losses[-14:]) / 14
+
+        if avg_loss == 0:
+            rsi = 100
+        else:
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
+    else:
+        # Simple momentum calculation for shorter periods
+        if len(prices) >= 5:
+            recent_avg = sum(prices[-5:]) / 5
+            older_avg = sum(prices[:5]) / 5
+            if older_avg > 0:
+                momentum = (recent_avg - older_avg) / older_avg
+                rsi = 50 + (momentum * 100)  # Convert to RSI-like scale
+                rsi = max(0, min(100, rsi))  # Clamp between 0 and 100
+            else:
+                rsi = 50
+        else:
+            rsi = 50
+
+    # Moving averages
+    sma_10 = sum(prices[-10:]) / min(10, len(prices))
+    sma_20 = sum(prices[-20:]) / min(20, len(prices))
+
+    # Trend determination
+    if len(prices) >= 10:
+        recent_prices = prices[-5:]
+        older_prices = prices[-10:-5] if len(prices) >= 10 else prices[:-5]
+
+        recent_avg = sum(recent_prices) / len(recent_prices)
+        older_avg = sum(older_prices) / len(older_prices) if older_prices else recent_avg
+
+        if recent_avg > older_avg * 1.02:  # 2% threshold
+            trend = 'UPTREND'
+        elif recent_avg < older_avg * 0.98:  # 2% threshold
+            trend = 'DOWNTREND'
+        else:
+            trend = 'SIDEWAYS'
+    else:
+        trend = 'SIDEWAYS'
+
+    return {
+        'rsi': round(rsi, 2),
+        'sma_10': round(sma_10, 2),
+        'sma_20': round(sma_20, 2),
+        'trend': trend
+    }
+
+
+def _reference_wilder_rsi(prices: List[float], period: int = RSI_PERIOD) -> float:
+    """Scalar textbook Wilder RSI"""
+    deltas = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
+    avg_gain = sum(max(d, 0) for d in deltas[:period]) / period
+    avg_loss = sum(max(-d, 0) for d in deltas[:period]) / period
+    for d in deltas[period:]:
+        avg_gain = (avg_gain * (period - 1) + max(d, 0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-d, 0)) / period
+    return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def random_histories(count: int = 400, seed: int = 7) -> Dict[str, List[float]]:
+    """Random-walk closes of assorted lengths (including empty / very short histories)"""
+    rng = random.Random(seed)
+    histories = {}
+    for n in range(count):
+        length = rng.choice([0, 1, 2, 4, 5, 9, 10, 13, 14, 15, 20, 30, 60])
+        price = rng.uniform(50, 5000)
+        closes = []
+        for _ in range(length):
+            price *= 1 + rng.gauss(0, 0.02)
+            closes.append(round(price, 2))
+        histories[f"SYM{n}"] = closes
+    return histories
+
+
+HISTORIES = random_histories()
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return universe_indicators(HISTORIES, rsi_method='simple')
+
+
+@pytest.mark.parametrize('symbol', list(HISTORIES))
+def test_matches_reference(engine, symbol):
+    expected = reference_indicators(HISTORIES[symbol])
+    got = engine[symbol]
+    for key in ('rsi', 'sma_10', 'sma_20'):
+        assert got[key] == pytest.approx(expected[key], abs=0.011), key
+    assert got['trend'] == expected['trend']
+
+
+@pytest.mark.parametrize('symbol', [s for s, closes in HISTORIES.items() if len(closes) > RSI_PERIOD])
+def test_wilder_rsi_matches_reference(engine, symbol):
+    assert engine[symbol]['rsi_wilder'] == pytest.approx(round(_reference_wilder_rsi(HISTORIES[symbol]), 2), abs=0.011)
@@ -0,0 +1,55 @@
+"""
+The sweep grid contains the generators' own layouts, and its leg P&L agrees
+with the batch backtester's payoffs
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from batch_backtester import BatchBacktester, CandidateTable
+from parameter_sweep import STRATEGY_TYPES, _mean_pnl, baseline_point, grid_candidates, grid_legs
+from strategy_rules import atm_strike_for, backtest_arguments, fallback_premium, strategy_legs
+
+
+@pytest.mark.parametrize('strategy_type', STRATEGY_TYPES)
+def test_baseline_is_the_generator_layout(strategy_type):
+    assert sorted(grid_legs(strategy_type, 1000, *baseline_point(strategy_type))) == \
+        sorted(strategy_legs(strategy_type, 1000))
+
+
+def test_baseline_is_always_on_the_grid():
+    candidates = grid_candidates('X', 1012, lambda strike, option_type: fallback_premium(strike, option_type, 1012),
+                                 offsets=(200,), wing_widths=(200,))
+    baselines = [c for c in candidates if c['baseline']]
+    assert sorted(c['strategy_type'] for c in baselines) == sorted(STRATEGY_TYPES)
+    for candidate in baselines:
+        assert sorted(candidate['legs']) == sorted(strategy_legs(candidate['strategy_type'], atm_strike_for(1012)))
+
+
+def test_baseline_scores_with_the_live_arguments():
+    candidates = grid_candidates('X', 1012, lambda strike, option_type: fallback_premium(strike, option_type, 1012))
+    for candidate in (c for c in candidates if c['baseline']):
+        expected = backtest_arguments(candidate['strategy_type'], atm_strike_for(1012), candidate['net_cost'])
+        assert (candidate['buy_strike'], candidate['sell_strike'], candidate['net_cost']) == expected
+
+
+def test_leg_pnl_matches_batch_payoff():
+    rng = random.Random(3)
+    closes = {}
+    for n in range(5):
+        price = rng.uniform(500, 3000)
+        closes[f"S{n}"] = [price := price * (1 + rng.gauss(0, 0.02)) for _ in range(120)]
+    candidates = []
+    for symbol, history in closes.items():
+        spot_price = history[-1]
+        # payoff() prices the Iron Condor with the generator's legs - only its baseline has those
+        candidates.extend(c for c in grid_candidates(symbol, spot_price,
+                                                     lambda strike, option_type: fallback_premium(strike, option_type,
+                                                                                                  spot_price))
+                          if c['strategy_type'] != 'Iron Condor' or c['baseline'])
+
+    backtester = BatchBacktester(closes, horizon=5)
+    expected = backtester.mean_payoff(CandidateTable.from_records(candidates))
+    np.testing.assert_allclose(_mean_pnl(backtester, candidates), expected, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,80 @@
+"""
+Walk-forward replay: selection -> backtest gate -> P&L at the exit day, on
+deterministic bars
+"""
+
+import random
+
+import backtest_kernels
+from lot_sizes import get_lot_size
+from strategy_rules import atm_strike_for, backtest_arguments
+from walk_forward import BACKTEST_DAYS, TECHNICAL_WINDOW, walk_forward_symbol
+
+DAY = 24 * 60 * 60
+
+
+def make_bars(closes, opens=None):
+    return {
+        'closes': list(closes),
+        'opens': list(opens if opens is not None else closes),
+        'timestamps': [i * DAY for i in range(len(closes))],
+        'dates': [f"day{i}" for i in range(len(closes))],
+    }
+
+
+def flat_premium(strike, option_type, spot_price):
+    return 5.0
+
+
+def test_sideways_market_trades_the_iron_condor_at_the_credit_floor():
+    # Alternating closes: RSI 50, SIDEWAYS, no intraday move
+    bars = make_bars([1000.0 if i % 2 else 1010.0 for i in range(45)])
+    trades = walk_forward_symbol('XYZ', bars, confidence=60, premium=flat_premium)
+
+    assert len(trades) == 45 - 5 - (TECHNICAL_WINDOW - 1)
+    for trade in trades:
+        assert (trade['strategy_type'], trade['status']) == ('Iron Condor', 'TRADED')
+        # Equal premiums leave no credit: generate_iron_condor's minimum credit of 10 applies
+        assert trade['net_cost'] == -10
+        # Exit inside the short strikes (ATM 1000 ± 50): the whole credit is kept
+        assert trade['pnl_per_share'] == 10
+        assert trade['pnl'] == 10 * get_lot_size('XYZ')
+
+
+def test_avoid_verdict_rejects_gated_strategies():
+    # Six weeks of decline, then a day closing 3% above its open: Long Call at confidence 70,
+    # with no past 5-day scenario rising to its breakeven
+    closes = [2000.0 * 0.99 ** i for i in range(40)] + [2000.0, 2020.0, 2040.0, 2060.0, 2080.0, 2100.0]
+    opens = list(closes)
+    opens[40] = closes[40] / 1.03
+    bars = make_bars(closes, opens)
+
+    gated = walk_forward_symbol('XYZ', bars, confidence=70, premium=flat_premium)[-1]
+    assert (gated['entry_date'], gated['strategy_type'], gated['status']) == ('day40', 'Long Call', 'REJECTED')
+    assert backtest_kernels.verdict(gated['backtest_score']) == 'AVOID'
+    assert gated['pnl'] == 0
+
+    ungated = walk_forward_symbol('XYZ', bars, confidence=70, premium=flat_premium, gate=False)[-1]
+    assert (ungated['strategy_type'], ungated['status'], ungated['net_cost']) == ('Long Call', 'TRADED', 5.0)
+    # ATM 2000 call, exit 2100
+    assert ungated['pnl_per_share'] == 95
+    assert ungated['pnl'] == 95 * get_lot_size('XYZ')
+
+
+def test_gate_replays_five_day_scenarios_whatever_the_holding_period():
+    rng = random.Random(2)
+    closes = [1000.0]
+    for _ in range(79):
+        closes.append(closes[-1] * (1 + rng.gauss(0, 0.015)))
+    bars = make_bars(closes)
+
+    trades = walk_forward_symbol('XYZ', bars, horizon=10, premium=flat_premium, gate=False)
+    scored = [t for t in trades if t['strategy_type'] == 'Iron Condor']
+    assert scored
+    for trade in scored:
+        t = int(trade['entry_date'][3:])
+        history = closes[max(0, t - BACKTEST_DAYS):t + 1]
+        expected = backtest_kernels.backtest('Iron Condor', history,
+                                             *backtest_arguments('Iron Condor', atm_strike_for(closes[t]), -10))
+        assert trade['backtest_score'] == round(expected['score'], 2)
+        assert trade['exit_date'] == f"day{t + 10}"
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Backtest Engine
+Replays years of stored daily bars per symbol: at every step the analyzer's
+selection rules (strategy_rules.select_strategy) pick a strategy from the data
+available that day, the generators' backtest gate is applied, and the trade's
+realised P&L at the exit day is recorded.
+- Technicals per step: the analyzer's 30-close RSI / trend, for every step at once
+- Backtest gate: practical_strategy_backtest's 30-calendar-day replay, as of the step
+- Symbols are spread across a process pool (each worker reads the SQLite store)
+Not replayable from price history: fundamentals / news confidence and option
+volume activity - they are fixed inputs (--confidence, --volume-volatility),
+and leg premiums come from a premium model (default: the analyzer's fallback
+premiums).
+
+Usage:
+  python walk_forward.py --years 3 --backfill --output walk_forward_trades.csv
+"""
+
+import argparse
+import bisect
+import concurrent.futures
+import csv
+import os
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import backtest_kernels
+import indicator_engine
+from lot_sizes import get_lot_size
+from price_history_store import PriceHistoryStore
+from strategy_rules import (BACKTEST_GATED, WATCH, atm_strike_for, backtest_arguments, fallback_premium,
+                            position_net_cost, select_strategy, strategy_legs)
+
+TECHNICAL_WINDOW = 30  # closes behind calculate_technical_indicators
+BACKTEST_DAYS = 30  # calendar days replayed by practical_strategy_backtest
+BACKTEST_MIN_CLOSES = 10
+
+TRADE_FIELDS = ('symbol', 'entry_date', 'exit_date', 'strategy_type', 'status', 'entry_price', 'exit_price',
+                'rsi', 'trend', 'price_change', 'net_cost', 'backtest_score', 'pnl_per_share', 'pnl')
+
+PremiumModel = Callable[[float, str, float], float]  # (strike, option type, spot) -> premium
+
+
+def intrinsic(option_type: str, strike: float, price: float) -> float:
+    return max(price - strike, 0.0) if option_type == 'CE' else max(strike - price, 0.0)
+
+
+def technicals(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """RSI ('simple', rounded like the analyzer) and trend as of every close (index t uses closes[:t + 1])"""
+    padded = np.concatenate([np.full(TECHNICAL_WINDOW - 1, np.nan), closes])
+    windows = sliding_window_view(padded, TECHNICAL_WINDOW)
+    return {
+        'rsi': np.round(indicator_engine.rsi(windows, method='simple'), 2),
+        'trend': indicator_engine.trend(windows),
+    }
+
+
+def walk_forward_symbol(symbol: str, bars: Dict[str, List], horizon: int = backtest_kernels.DEFAULT_HORIZON,
+                        step: int = 1, confidence: int = 60, volume_volatility: str = 'LOW',
+                        lots: int = 1, gate: bool = True, premium: PremiumModel = fallback_premium) -> List[Dict]:
+    """
+    Trades for one symbol (one per step; 'WATCH' / 'REJECTED' steps have no P&L)
+    bars: PriceHistoryStore.load() dict (oldest first)
+    horizon: trading days to the exit (the gate always replays the live 5-day scenarios)
+    """
+    closes = np.asarray(bars['closes'], dtype=np.float64)
+    opens = bars['opens']
+    timestamps = bars['timestamps']
+    if len(closes) <= TECHNICAL_WINDOW + horizon:
+        return []
+
+    lot_size = get_lot_size(symbol)
+    indicators = technicals(closes)
+    trades = []
+    for t in range(TECHNICAL_WINDOW - 1, len(closes) - horizon, step):
+        spot_price = float(closes[t])
+        # The analyzer's pChange: the day's move from its open
+        price_change = (spot_price - opens[t]) / opens[t] * 100 if opens[t] else 0.0
+        rsi = float(indicators['rsi'][t])
+        trend = indicators['trend'][t]
+        trade = {
+            'symbol': symbol, 'entry_date': bars['dates'][t], 'exit_date': bars['dates'][t + horizon],
+            'entry_price': spot_price, 'exit_price': float(closes[t + horizon]), 'rsi': rsi, 'trend': trend,
+            'price_change': round(float(price_change), 2), 'net_cost': 0.0, 'backtest_score': None,
+            'pnl_per_share': 0.0, 'pnl': 0.0
+        }
+
+        strategy_type = select_strategy(trend, price_change, rsi, confidence, volume_volatility)
+        trade['strategy_type'] = strategy_type
+        if strategy_type == WATCH:
+            trades.append(dict(trade, status='WATCH'))
+            continue
+
+        atm_strike = atm_strike_for(spot_price)
+        legs = [(option_type, strike, quantity, premium(strike, option_type, spot_price))
+                for option_type, strike, quantity in strategy_legs(strategy_type, atm_strike)]
+        net_cost = position_net_cost(strategy_type, legs)
+        trade['net_cost'] = round(net_cost, 2)
+
+        # The generator's backtest gate, on the 30 calendar days up to the entry day
+        first = bisect.bisect_left(timestamps, timestamps[t] - BACKTEST_DAYS * 24 * 60 * 60)
+        history = closes[first:t + 1]
+        if len(history) >= BACKTEST_MIN_CLOSES:
+            buy_strike, sell_strike, cost = backtest_arguments(strategy_type, atm_strike, net_cost)
+            result = backtest_kernels.backtest(strategy_type, history, buy_strike, sell_strike, cost)
+            trade['backtest_score'] = round(result['score'], 2)
+            if gate and strategy_type in BACKTEST_GATED and result['verdict'] == 'AVOID':
+                trades.append(dict(trade, status='REJECTED'))
+                continue
+
+        exit_price = trade['exit_price']
+        pnl_per_share = sum(quantity * intrinsic(option_type, strike, exit_price)
+                            for option_type, strike, quantity, _ in legs) - net_cost
+        trades.append(dict(trade, status='TRADED', pnl_per_share=round(pnl_per_share, 2),
+                           pnl=round(pnl_per_share * lot_size * lots, 2)))
+    return trades
+
+
+def _symbol_task(args) -> List[Dict]:
+    """Process-pool worker: load one symbol from the store and replay it"""
+    symbol, store_path, days, options = args
+    store = PriceHistoryStore(store_path)
+    try:
+        bars = store.load(symbol, days=days)
+    finally:
+        store.close()
+    return walk_forward_symbol(symbol, bars, **options)
+
+
+def run_walk_forward(symbols: List[str], days: int, store_path: Optional[str] = None,
+                     max_workers: Optional[int] = None, **options) -> List[Dict]:
+    """Walk-forward trades for many symbols, one process-pool task per symbol"""
+    store_path = store_path or PriceHistoryStore().path
+    tasks = [(symbol, store_path, days, options) for symbol in symbols]
+    trades = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for symbol_trades in executor.map(_symbol_task, tasks, chunksize=4):
+            trades.extend(symbol_trades)
+    return trades
+
+
+def summarize(trades: List[Dict]) -> List[Dict]:
+    """Per-strategy trade count, win rate and P&L of the executed trades"""
+    by_strategy = {}
+    for trade in trades:
+        if trade['status'] == 'TRADED':
+            by_strategy.setdefault(trade['strategy_type'], []).append(trade['pnl'])
+    summary = []
+    for strategy_type, pnl in sorted(by_strategy.items()):
+        pnl = np.asarray(pnl)
+        summary.append({
+            'strategy_type': strategy_type,
+            'trades': len(pnl),
+            'win_rate': round(float(np.mean(pnl > 0) * 100), 1),
+            'total_pnl': round(float(pnl.sum()), 2),
+            'avg_pnl': round(float(pnl.mean()), 2),
+        })
+    return summary
+
+
+def backfill(symbols: List[str], days: int, store: PriceHistoryStore, max_workers: int = 10) -> int:
+    """Download `days` of daily bars into the store (one batched Yahoo download)"""
+    from yahoo_client import YahooClient, chart_bars
+
+    yahoo = YahooClient(max_workers=max_workers)
+    stored = 0
+    try:
+        for symbol, data in yahoo.download(symbols, days=days).items():
+            result = ((data or {}).get('chart') or {}).get('result')
+            if not result or not result[0].get('indicators', {}).get('quote'):
+                continue
+            bars = chart_bars(result[0])
+            if bars['closes']:
+                stored += store.append(symbol, bars, result[0].get('meta', {}).get('gmtoffset', 0))
+    finally:
+        yahoo.close()
+    return stored
+
+
+def main():
+    from fno_symbols import get_all_fno_symbols
+
+    parser = argparse.ArgumentParser(description='Multi-year walk-forward replay of the strategy selection rules')
+    parser.add_argument('--symbols', nargs='*', help='default: every F&O symbol')
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--horizon', type=int, default=backtest_kernels.DEFAULT_HORIZON, help='holding period (trading days)')
+    parser.add_argument('--step', type=int, default=1, help='trading days between entries')
+    parser.add_argument('--confidence', type=int, default=60, help='fixed confidence fed to the selection rules')
+    parser.add_argument('--volume-volatility', default='LOW', choices=('HIGH', 'MEDIUM', 'LOW'))
+    parser.add_argument('--lots', type=int, default=1)
+    parser.add_argument('--no-gate', action='store_true', help='ignore the backtest AVOID gate')
+    parser.add_argument('--backfill', action='store_true', help='download missing history from Yahoo first')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default='walk_forward_trades.csv')
+    args = parser.parse_args()
+
+    symbols = [s.upper() for s in args.symbols] if args.symbols else get_all_fno_symbols()
+    days = int(args.years * 365)
+    store = PriceHistoryStore()
+    if args.backfill:
+        print(f"📥 Backfilling {days} days for {len(symbols)} symbols...")
+        print(f"   {backfill(symbols, days, store)} bars stored")
+    stored = set(store.symbols())
+    store_path = store.path
+    store.close()
+
+    symbols = [s for s in dict.fromkeys(symbols) if s in stored]
+    print(f"🔁 Walk-forward over {len(symbols)} symbols, {args.years:g} years, {args.horizon}-day holds "
+          f"({args.workers} processes)")
+    trades = run_walk_forward(symbols, days, store_path, args.workers, horizon=args.horizon, step=args.step,
+                              confidence=args.confidence, volume_volatility=args.volume_volatility,
+                              lots=args.lots, gate=not args.no_gate)
+
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=TRADE_FIELDS)
+        writer.writeheader()
+        writer.writerows(trades)
+
+    print(f"✅ {len(trades)} steps → {args.output}")
+    for row in summarize(trades):
+        print(f"   {row['strategy_type']:<16} {row['trades']:>6} trades, win rate {row['win_rate']:>5.1f}%, "
+              f"total ₹{row['total_pnl']:>14,.0f}, avg ₹{row['avg_pnl']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
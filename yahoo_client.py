@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Pooled Yahoo Finance Client
+One keep-alive session shared by every worker thread, so a full run reuses a
+handful of persistent connections to query1.finance.yahoo.com instead of
+opening a new TCP / TLS connection per symbol.
+- chart(): daily OHLCV chart for one symbol
+- download(): charts for a whole symbol list with bounded concurrency
+- quote_summary(): fundamentals modules for one ticker
+"""
+
+import concurrent.futures
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from http_transport import new_session
+
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
+QUOTE_SUMMARY_URL = "https://query1.finance.yahoo.com/v10/finance/quoteSummary/{ticker}"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def yahoo_ticker(symbol: str) -> str:
+    """NSE symbol -> Yahoo ticker"""
+    if symbol == 'NIFTY':
+        return '^NSEI'  # NIFTY 50 index
+    if symbol == 'BANKNIFTY':
+        return '^NSEBANK'  # Bank NIFTY index
+    if symbol.startswith('^'):
+        return symbol  # Index symbols like ^NSEI
+    return f"{symbol}.NS"  # Add .NS for Indian stocks
+
+
+def chart_bars(chart: Dict) -> Dict[str, List]:
+    """
+    One chart result -> bars dict of parallel lists (timestamps, opens, highs, lows, closes, volumes)
+    Bars without a close are dropped; other missing fields stay None
+    """
+    quote = chart['indicators']['quote'][0]
+    timestamps = chart.get('timestamp', []) or []
+    series = {field: quote.get(name, []) or [] for field, name in
+              (('opens', 'open'), ('highs', 'high'), ('lows', 'low'), ('closes', 'close'), ('volumes', 'volume'))}
+
+    bars = {'timestamps': []}
+    bars.update({field: [] for field in series})
+    for i, ts in enumerate(timestamps):
+        if i >= len(series['closes']) or series['closes'][i] is None:
+            continue
+        bars['timestamps'].append(ts)
+        for field, values in series.items():
+            bars[field].append(values[i] if i < len(values) else None)
+    return bars
+
+
+class YahooClient:
+    """Thread-safe Yahoo Finance client on one pooled session"""
+
+    def __init__(self, pool_maxsize: int = 20, max_workers: int = 10, timeout: int = 15):
+        # pool_maxsize >= worker threads, otherwise urllib3 discards connections after use
+        self.session = new_session(pool_maxsize=pool_maxsize)
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def chart_response(self, symbol: str, days: int = 90, interval: str = '1d',
+                       start: Optional[int] = None) -> requests.Response:
+        """Raw chart response for the last `days` days (or from epoch `start` when given)"""
+        end_date = int(time.time())
+        start_date = start if start is not None else end_date - (days * 24 * 60 * 60)
+        params = {
+            'period1': start_date,
+            'period2': end_date,
+            'interval': interval,
+            'includePrePost': 'false'
+        }
+        url = CHART_URL.format(ticker=yahoo_ticker(symbol))
+        return self.session.get(url, params=params, headers=HEADERS, timeout=self.timeout)
+
+    def chart(self, symbol: str, days: int = 90, interval: str = '1d',
+              start: Optional[int] = None) -> Optional[Dict]:
+        """Decoded chart JSON, or None on HTTP / network / JSON errors"""
+        try:
+            response = self.chart_response(symbol, days, interval, start)
+            if response.status_code != 200:
+                return None
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+
+    def download(self, symbols: List[str], days: int = 90, interval: str = '1d',
+                 max_workers: Optional[int] = None, starts: Optional[Dict[str, int]] = None) -> Dict[str, Optional[Dict]]:
+        """
+        Charts for many symbols at once (bounded concurrency over the shared pool)
+        starts: per-symbol epoch start (incremental download); other symbols get `days` days
+        Returns: {symbol: chart JSON or None}
+        """
+        symbols = list(dict.fromkeys(symbols))
+        starts = starts or {}
+        workers = max(1, min(max_workers or self.max_workers, len(symbols) or 1))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            charts = executor.map(lambda symbol: self.chart(symbol, days, interval, starts.get(symbol)), symbols)
+            return dict(zip(symbols, charts))
+
+    def quote_summary(self, ticker: str, modules: str = 'financialData,defaultKeyStatistics',
+                      timeout: int = 10) -> Optional[Dict]:
+        """First quoteSummary result for a Yahoo ticker (e.g. RELIANCE.NS), or None"""
+        url = QUOTE_SUMMARY_URL.format(ticker=ticker)
+        response = self.session.get(url, params={'modules': modules}, headers=HEADERS, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        return response.json()['quoteSummary']['result'][0]
+
+    def close(self):
+        self.session.close()